@@ -0,0 +1,470 @@
+"""
+Advent of Code 2024 - benchmark suite
+Deterministic synthetic inputs for every day, scaled to N times the puzzle size, with the
+wall time and peak memory of each solve_part* call appended to a JSON history.
+
+Usage: python benchmark.py [DAY ...] [--scales 1 10 100] [--timeout 600] [--history bench_history.json]
+"""
+
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import queue
+import random
+import string
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from runner import ROOT, discover_days, load_day
+
+DEFAULT_SCALES = [1, 10, 100]
+
+
+def side_for(base, scale):
+    """Grid side so that the number of cells grows linearly with the scale"""
+    return max(1, round(base * math.sqrt(scale)))
+
+
+def grid_text(rows):
+    return "\n".join("".join(row) for row in rows) + "\n"
+
+
+def perfect_maze(rng, side):
+    """Odd-sized maze with exactly one path between any two open cells (iterative backtracker)"""
+    side |= 1
+    grid = [["#"] * side for _ in range(side)]
+    grid[1][1] = "."
+    stack = [(1, 1)]
+    while stack:
+        row, col = stack[-1]
+        neighbours = [(row + dr, col + dc, row + dr // 2, col + dc // 2)
+                      for dr, dc in [(-2, 0), (2, 0), (0, -2), (0, 2)]
+                      if 0 < row + dr < side - 1 and 0 < col + dc < side - 1 and grid[row + dr][col + dc] == "#"]
+        if not neighbours:
+            stack.pop()
+            continue
+        new_row, new_col, wall_row, wall_col = rng.choice(neighbours)
+        grid[wall_row][wall_col] = grid[new_row][new_col] = "."
+        stack.append((new_row, new_col))
+    return grid
+
+
+def generate_day_01(rng, scale):
+    return "".join(f"{rng.randint(10000, 99999)}   {rng.randint(10000, 99999)}\n" for _ in range(1000 * scale))
+
+
+def generate_day_02(rng, scale):
+    lines = []
+    for _ in range(1000 * scale):
+        level, step = rng.randint(10, 90), rng.choice([-1, 1])
+        report = [level]
+        for _ in range(rng.randint(4, 7)):
+            report.append(report[-1] + step * rng.choice([0, 1, 2, 3, 3, 4]))
+        lines.append(" ".join(map(str, report)))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day_03(rng, scale):
+    tokens = ["mul({},{})", "mul({},{}]", "mul( {},{})", "do()", "don't()", "what()", "from()", "%&*#"]
+    weights = [10, 2, 2, 1, 1, 2, 2, 20]
+    lines = []
+    for _ in range(6 * scale):
+        parts = [rng.choices(tokens, weights)[0].format(rng.randint(1, 999), rng.randint(1, 999))
+                 for _ in range(400)]
+        lines.append("".join(parts))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day_04(rng, scale):
+    side = side_for(140, scale)
+    return grid_text([[rng.choice("XMAS") for _ in range(side)] for _ in range(side)])
+
+
+def generate_day_05(rng, scale):
+    pages = rng.sample(range(10, 100), 49)
+    rules = [f"{before}|{after}" for i, before in enumerate(pages) for after in pages[i + 1:]]
+    rng.shuffle(rules)
+    updates = []
+    for _ in range(200 * scale):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+        updates.append(",".join(map(str, update)))
+    return "\n".join(rules) + "\n\n" + "\n".join(updates) + "\n"
+
+
+def generate_day_06(rng, scale):
+    """
+    The guard starts in the middle of an outward spiral of obstacles, rings 4 cells apart, so its
+    path covers about a quarter of the map and always leaves it. Random obstacles are only added
+    off that path.
+    """
+    side = side_for(130, scale)
+    gap = 4
+    grid = [["."] * side for _ in range(side)]
+    row = col = side // 2
+    grid[row][col] = "^"
+    path = {(row, col)}
+    inside = lambda row, col: 0 <= row < side and 0 <= col < side
+
+    # Up, right, down, left: the guard turns right at each obstacle
+    length = gap
+    for turn in itertools.count():
+        dr, dc = [(-1, 0), (0, 1), (1, 0), (0, -1)][turn % 4]
+        for _ in range(length):
+            row, col = row + dr, col + dc
+            path.add((row, col))
+        if not inside(row + dr, col + dc):
+            break
+        grid[row + dr][col + dc] = "#"
+        if turn % 2:
+            length += gap
+
+    for row in range(side):
+        for col in range(side):
+            if (row, col) not in path and rng.random() < 0.015:
+                grid[row][col] = "#"
+    return grid_text(grid)
+
+
+def generate_day_07(rng, scale):
+    operators = [lambda x, y: x + y, lambda x, y: x * y, lambda x, y: int(f"{x}{y}")]
+    lines = []
+    for _ in range(850 * scale):
+        numbers = [rng.randint(1, 99) for _ in range(rng.randint(3, 12))]
+        value = numbers[0]
+        for number in numbers[1:]:
+            value = rng.choice(operators)(value, number)
+        if rng.random() < 0.5:
+            value += 1
+        lines.append(f"{value}: {' '.join(map(str, numbers))}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_day_08(rng, scale):
+    side = side_for(50, scale)
+    grid = [["."] * side for _ in range(side)]
+    frequencies = string.ascii_letters + string.digits
+    for _ in range(min(side * side // 2, 200 * scale)):
+        grid[rng.randrange(side)][rng.randrange(side)] = rng.choice(frequencies)
+    return grid_text(grid)
+
+
+def generate_day_09(rng, scale):
+    return "".join(str(rng.randint(1, 9) if i % 2 == 0 else rng.randint(0, 9))
+                   for i in range(19999 * scale)) + "\n"
+
+
+def generate_day_10(rng, scale):
+    side = side_for(50, scale)
+    return grid_text([[str((row + col + (rng.random() < 0.1)) % 10) for col in range(side)] for row in range(side)])
+
+
+def generate_day_11(rng, scale):
+    return " ".join(str(rng.randint(0, 10 ** rng.randint(1, 7))) for _ in range(8 * scale)) + "\n"
+
+
+def generate_day_12(rng, scale):
+    side = side_for(140, scale)
+    block = 8
+    plants = [[rng.choice(string.ascii_uppercase) for _ in range(side // block + 1)] for _ in range(side // block + 1)]
+    return grid_text([[rng.choice(string.ascii_uppercase) if rng.random() < 0.05 else plants[row // block][col // block]
+                       for col in range(side)] for row in range(side)])
+
+
+def generate_day_13(rng, scale):
+    machines = []
+    for _ in range(320 * scale):
+        ax, ay, bx, by = (rng.randint(10, 99) for _ in range(4))
+        a, b = rng.randint(1, 100), rng.randint(1, 100)
+        px, py = a * ax + b * bx, a * ay + b * by
+        if rng.random() < 0.5:
+            px += rng.randint(1, 50)
+        machines.append(f"Button A: X+{ax}, Y+{ay}\nButton B: X+{bx}, Y+{by}\nPrize: X={px}, Y={py}")
+    return "\n\n".join(machines) + "\n"
+
+
+def generate_day_14(rng, scale):
+    """Random robots, except for a quarter of them which line up into a filled square at some time t"""
+    width, height = 101, 103
+    robots = 500 * scale
+    t = rng.randint(101, width * height - 1)
+    square = min(math.isqrt(robots // 4) + 1, width - 1)
+    left, top = rng.randrange(width - square), rng.randrange(height - square)
+    lines = []
+    for i in range(robots):
+        vx, vy = rng.choice([-1, 1]) * rng.randint(1, 99), rng.choice([-1, 1]) * rng.randint(1, 99)
+        if i < square * square and i < width * height:
+            x, y = left + i % square, top + i // square
+            px, py = (x - vx * t) % width, (y - vy * t) % height
+        else:
+            px, py = rng.randrange(width), rng.randrange(height)
+        lines.append(f"p={px},{py} v={vx},{vy}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_day_15(rng, scale):
+    side = side_for(50, scale)
+    grid = [["#" if row in (0, side - 1) or col in (0, side - 1) else
+             rng.choices(".O#", [70, 25, 5])[0] for col in range(side)] for row in range(side)]
+    grid[side // 2][side // 2] = "@"
+    moves = "".join(rng.choice("<>^v") for _ in range(20000 * scale))
+    lines = [moves[i:i + 1000] for i in range(0, len(moves), 1000)]
+    return grid_text(grid) + "\n" + "\n".join(lines) + "\n"
+
+
+def generate_day_16(rng, scale):
+    grid = perfect_maze(rng, side_for(141, scale))
+    for _ in range(len(grid) ** 2 // 20):
+        row, col = rng.randrange(1, len(grid) - 1), rng.randrange(1, len(grid) - 1)
+        grid[row][col] = "."
+    grid[len(grid) - 2][1], grid[1][len(grid) - 2] = "S", "E"
+    return grid_text(grid)
+
+
+def generate_day_17(rng, scale):
+    """
+    The usual 3-bit shifting program, with bxl operands among the few pairs for which it can be
+    its own output. It is scaled through register A, as part 1 prints one digit per 3 bits of A.
+    Part 2 does not depend on A, so it stays puzzle-sized.
+    """
+    first, second = rng.choice([(1, 5), (2, 3), (3, 5)])
+    program = [2, 4, 1, first, 7, 5, 1, second, 4, 4, 5, 5, 0, 3, 3, 0]
+    return (f"Register A: {rng.getrandbits(48 * scale)}\nRegister B: 0\nRegister C: 0\n\n"
+            f"Program: {','.join(map(str, program))}\n")
+
+
+def generate_day_18(rng, scale):
+    """Always puzzle-sized, see FIXED_SIZE"""
+    side = 71
+    cells = [(x, y) for x in range(side) for y in range(side) if (x, y) not in {(0, 0), (side - 1, side - 1)}]
+    rng.shuffle(cells)
+    return "".join(f"{x},{y}\n" for x, y in cells[:3450])
+
+
+def generate_day_19(rng, scale):
+    patterns = sorted({"".join(rng.choice("wubrg") for _ in range(rng.randint(1, 8))) for _ in range(450)})
+    designs = []
+    for _ in range(400 * scale):
+        design = "".join(rng.choice(patterns) for _ in range(rng.randint(5, 12)))
+        if rng.random() < 0.3:
+            design += rng.choice("wubrg") * 3
+        designs.append(design)
+    return ", ".join(patterns) + "\n\n" + "\n".join(designs) + "\n"
+
+
+def generate_day_20(rng, scale):
+    grid = perfect_maze(rng, side_for(141, scale))
+    grid[len(grid) - 2][1], grid[1][len(grid) - 2] = "S", "E"
+    return grid_text(grid)
+
+
+def generate_day_21(rng, scale):
+    return "".join(f"{rng.randint(1, 999):03d}A\n" for _ in range(5 * scale))
+
+
+def generate_day_22(rng, scale):
+    return "".join(f"{rng.randrange(1, 16777216)}\n" for _ in range(2000 * scale))
+
+
+def generate_day_23(rng, scale):
+    nodes = 520 * scale
+    length = max(2, math.ceil(math.log(2 * nodes, 26)))
+    names = set()
+    while len(names) < nodes:
+        names.add("".join(rng.choice(string.ascii_lowercase) for _ in range(length)))
+    names = sorted(names)
+    edges = {tuple(sorted(rng.sample(names, 2))) for _ in range(len(names) * 6)}
+    clique = rng.sample(names, 13)
+    edges |= {tuple(sorted((a, b))) for i, a in enumerate(clique) for b in clique[i + 1:]}
+    return "".join(f"{a}-{b}\n" for a, b in sorted(edges, key=lambda _: rng.random()))
+
+
+def generate_day_24(rng, scale):
+    """Ripple-carry adder where the XOR and AND outputs of the input bits are swapped in four positions"""
+    bits = 45 * scale
+    width = len(str(bits))
+    wire = lambda prefix, i: f"{prefix}{i:0{width}d}"
+    used = set()
+
+    def fresh():
+        while (name := "".join(rng.choice("abcdefghijklmnopqrstuvw") for _ in range(3 + width - 2))) in used:
+            pass
+        used.add(name)
+        return name
+
+    swapped = set(rng.sample(range(1, bits - 1), 4))
+    values = [f"{wire(p, i)}: {rng.randint(0, 1)}" for p in "xy" for i in range(bits)]
+    gates = [f"{wire('x', 0)} XOR {wire('y', 0)} -> {wire('z', 0)}"]
+    carry = fresh()
+    gates.append(f"{wire('x', 0)} AND {wire('y', 0)} -> {carry}")
+    for i in range(1, bits):
+        partial, direct, chained = fresh(), fresh(), fresh()
+        carry_out = wire("z", bits) if i == bits - 1 else fresh()
+        xor_out, and_out = (direct, partial) if i in swapped else (partial, direct)
+        gates += [f"{wire('x', i)} XOR {wire('y', i)} -> {xor_out}",
+                  f"{wire('x', i)} AND {wire('y', i)} -> {and_out}",
+                  f"{partial} XOR {carry} -> {wire('z', i)}",
+                  f"{partial} AND {carry} -> {chained}",
+                  f"{chained} OR {direct} -> {carry_out}"]
+        carry = carry_out
+    rng.shuffle(gates)
+    return "\n".join(values) + "\n\n" + "\n".join(gates) + "\n"
+
+
+def generate_day_25(rng, scale):
+    schematics = []
+    for _ in range(500 * scale):
+        heights = [rng.randint(0, 5) for _ in range(5)]
+        rows = [["#" if row <= height else "." for height in heights] for row in range(7)]
+        rows[0] = ["#"] * 5
+        rows = rows if rng.random() < 0.5 else rows[::-1]
+        schematics.append(grid_text(rows).strip())
+    return "\n\n".join(schematics) + "\n"
+
+
+# Days whose solver is hard-wired to the puzzle size: they only run at scale 1
+FIXED_SIZE = {18: "its solver has the 71x71 memory space and the exit at 70,70 built in"}
+
+GENERATORS = {int(name[len("generate_day_"):]): fn for name, fn in globals().items() if name.startswith("generate_day_")}
+
+
+def generate_input(day, scale, seed=0):
+    return GENERATORS[day](random.Random(f"{seed}-{day}-{scale}"), scale)
+
+
+def measure(day, part, input_data, track_memory):
+    """
+    Run one solve_part* call on freshly parsed data, return (seconds, peak bytes or None, answer),
+    or None when the day has no such part.
+    """
+    module = load_day(day)
+    solver = getattr(module, f"solve_part{part}", None)
+    if solver is None:
+        return None
+    data = module.parse_input(input_data)
+
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    answer = solver(data)
+    seconds = time.perf_counter() - start
+    peak = None
+    if track_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return seconds, peak, str(answer)
+
+
+def measure_to_queue(results, *args):
+    try:
+        results.put((True, measure(*args)))
+    except Exception as e:
+        results.put((False, f"{type(e).__name__}: {e}"))
+
+
+def measure_in_child(day, part, input_data, track_memory, timeout):
+    """
+    Isolate each call in its own process, so that a runaway solver can be killed.
+    A plain (non-daemonic) process is used so that the solvers can start their own pools.
+    """
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=measure_to_queue, args=(results, day, part, input_data, track_memory))
+    process.start()
+    try:
+        ok, value = results.get(timeout=timeout)
+    except queue.Empty:
+        process.kill()
+        raise TimeoutError(f"timeout after {timeout}s")
+    finally:
+        process.join()
+    if not ok:
+        raise RuntimeError(value)
+    return value
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(days, scales, seed=0, timeout=None, track_memory=True):
+    """
+    Time every part of every day at every scale.
+    Memory is measured in a second run, as tracemalloc slows the solvers down by a lot.
+    """
+    commit = current_commit()
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    for day in days:
+        for scale in scales:
+            if day in FIXED_SIZE and scale > 1:
+                continue
+            input_data = generate_input(day, scale, seed)
+            for part in (1, 2):
+                record = {"timestamp": timestamp, "commit": commit, "day": day, "part": part,
+                          "scale": scale, "seed": seed, "input_bytes": len(input_data),
+                          "seconds": None, "peak_bytes": None, "answer": None, "error": None}
+                try:
+                    if (measured := measure_in_child(day, part, input_data, False, timeout)) is None:
+                        continue
+                    record["seconds"], _, record["answer"] = measured
+                    if track_memory:
+                        _, record["peak_bytes"], _ = measure_in_child(day, part, input_data, True, timeout)
+                except (TimeoutError, RuntimeError) as e:
+                    record["error"] = str(e)
+                yield record
+
+
+def append_history(records, history_path):
+    history_path = Path(history_path)
+    history = json.loads(history_path.read_text()) if history_path.exists() else []
+    history.extend(records)
+    history_path.write_text(json.dumps(history, indent=1) + "\n")
+
+
+def format_record(record):
+    if record["error"]:
+        result = record["error"]
+    else:
+        peak = f"{record['peak_bytes'] / 2**20:9.2f} MiB" if record["peak_bytes"] is not None else f"{'-':>13}"
+        result = f"{record['seconds']:10.3f}s {peak}"
+    return f"day {record['day']:02d} part {record['part']} x{record['scale']:<4} {result}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Advent of Code 2024 solvers on scaled synthetic inputs")
+    parser.add_argument("days", nargs="*", type=int, help="days to benchmark (default: every day found)")
+    parser.add_argument("--scales", nargs="+", type=int, default=DEFAULT_SCALES, help="input size multipliers")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the input generators")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed per solve_part* call")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--history", default=ROOT / "bench_history.json", help="JSON file the results are appended to")
+    parser.add_argument("--dump", type=int, metavar="SCALE", help="print the generated input of a single day and exit")
+    args = parser.parse_args()
+
+    days = args.days or discover_days()
+    if args.dump:
+        print(generate_input(days[0], args.dump, args.seed), end="")
+        return
+
+    for day in days:
+        if day in FIXED_SIZE and max(args.scales) > 1:
+            print(f"day {day:02d} only runs at x1: {FIXED_SIZE[day]}")
+
+    records = []
+    for record in run_benchmark(days, args.scales, args.seed, args.timeout, not args.no_memory):
+        print(format_record(record), flush=True)
+        records.append(record)
+    append_history(records, args.history)
+
+
+if __name__ == "__main__":
+    main()
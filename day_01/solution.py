@@ -3,25 +3,133 @@ Advent of Code 2024 - Day 1
 https://adventofcode.com/2024/day/1
 """
 
+import heapq
+import tempfile
+from array import array
+from itertools import groupby
+
+try:
+    import numpy as np
+except ImportError: # Sorting falls back to sorted()
+    np = None
+
 def parse_input(input_data):
     """Parse the puzzle input."""
     return [line.strip() for line in input_data.split('\n') if line.strip()]
 
-def to_lists(pairs):
-    return list(zip(*[map(int, pair.split()) for pair in pairs]))
+def sort_in_place(values):
+    """Sort an array('q') without going through a list of Python ints, when NumPy is around"""
+    if np is not None and len(values):
+        np.frombuffer(values, dtype=np.int64).sort()
+    else:
+        values[:] = array('q', sorted(values))
+    return values
+
+def read_run(run, block_size=1 << 16):
+    run.seek(0)
+    while True:
+        block = array('q')
+        try:
+            block.fromfile(run, block_size)
+        except EOFError: # Raised on the last, shorter block, which is still read
+            yield from block
+            return
+        yield from block
+
+def write_run(values, block_size=1 << 16):
+    """Write sorted values to a new temporary file, block by block"""
+    run = tempfile.TemporaryFile()
+    block = array('q')
+    for value in values:
+        block.append(value)
+        if len(block) == block_size:
+            block.tofile(run)
+            block = array('q')
+    block.tofile(run)
+    return run
+
+class ExternalSorter:
+    """
+    Collects ints in an array('q') and yields them back sorted. Whenever more than budget values
+    are held, they are sorted and spilled to a temporary file, and the runs are merged at the end.
+    Past max_runs files, the runs are first merged into a single one to bound open files.
+    """
+    def __init__(self, budget=1 << 24, max_runs=64):
+        self.budget = budget
+        self.max_runs = max_runs
+        self.values = array('q')
+        self.runs = []
+
+    def add(self, value):
+        self.values.append(value)
+        if len(self.values) >= self.budget:
+            self.spill()
+
+    def spill(self):
+        if len(self.runs) >= self.max_runs:
+            merged = write_run(heapq.merge(*map(read_run, self.runs)))
+            self.close()
+            self.runs = [merged]
+        run = tempfile.TemporaryFile()
+        sort_in_place(self.values).tofile(run)
+        self.runs.append(run)
+        self.values = array('q')
+
+    def __iter__(self):
+        sort_in_place(self.values)
+        if not self.runs:
+            return iter(self.values)
+        return heapq.merge(*map(read_run, self.runs), self.values)
+
+    def close(self):
+        for run in self.runs:
+            run.close()
+
+def sorted_columns(lines, budget=1 << 24):
+    """Both columns parsed straight into external sorters, in one pass over the lines"""
+    left, right = ExternalSorter(budget), ExternalSorter(budget)
+    for line in lines:
+        if line.strip():
+            e1, e2 = line.split()
+            left.add(int(e1))
+            right.add(int(e2))
+    return left, right
+
+def total_distance(sorted_left, sorted_right):
+    return sum(abs(e1 - e2) for (e1, e2) in zip(sorted_left, sorted_right))
+
+def similarity_score(sorted_left, sorted_right):
+    """Merge walk over the runs of equal values of both sorted lists, instead of Counters"""
+    right_runs = ((e, sum(1 for _ in run)) for e, run in groupby(sorted_right))
+    right_value, right_count = next(right_runs, (None, 0))
+    score = 0
+    for e, run in groupby(sorted_left):
+        while right_value is not None and right_value < e:
+            right_value, right_count = next(right_runs, (None, 0))
+        if right_value == e:
+            score += e * sum(1 for _ in run) * right_count
+    return score
+
+def compare_lists(lines, budget=1 << 24):
+    """Both parts, holding at most budget values of each column in memory at a time"""
+    left, right = sorted_columns(lines, budget)
+    try:
+        return total_distance(left, right), similarity_score(left, right)
+    finally:
+        left.close()
+        right.close()
+
+def compare_file(input_file, budget=1 << 24):
+    with open(input_file) as f:
+        return compare_lists(f, budget)
 
 def solve_part1(data):
     """Solve part 1 of the puzzle."""
-    l1, l2 = to_lists(data)
-    l1s, l2s = sorted(l1), sorted(l2)
-    return sum(abs(e1 - e2) for (e1, e2) in zip(l1s, l2s))
+    return compare_lists(data)[0]
 
 def solve_part2(data):
     """Solve part 2 of the puzzle."""
-    from collections import Counter
-    l1, l2 = to_lists(data)
-    s1, s2 = Counter(l1), Counter(l2)
-    return sum([s2[e] * e * s1[e] for e in s1.keys()])
+    return compare_lists(data)[1]
 
 def main(input_file="input/input.txt"):
     """Main function to run the solution."""
@@ -3,6 +3,13 @@ Advent of Code 2024 - Day 2
 https://adventofcode.com/2024/day/2
 """
 
+from collections import defaultdict
+
+try:
+    import numpy as np
+except ImportError: # Only needed by the batch evaluator
+    np = None
+
 def parse_input(input_data):
     """Parse the puzzle input."""
     return [line.strip() for line in input_data.split('\n') if line.strip()]
@@ -20,15 +27,111 @@ def is_safe(report):
             return False
     return True
 
-def is_safe2(report):
-    if is_safe(report):
-        return True
-    for i in range(len(report)):
-        subreport = report[:i] + report[i+1:]
-        if is_safe(subreport):
+def first_violation(report, direction, skip=None):
+    """
+    Indexes of the first two consecutive levels (ignoring the skipped index) that aren't a step of
+    1 to 3 in the given direction, or None if there are none
+    """
+    previous = None
+    for i, level in enumerate(report):
+        if i == skip:
+            continue
+        if previous is not None and not 1 <= (level - report[previous]) * direction <= 3:
+            return previous, i
+        previous = i
+    return None
+
+def is_safe_with_removal(report):
+    """
+    Whether removing at most one level makes the report safe, in O(n) and without copies: any
+    removal that fixes a report must remove one of the two levels of its first violation, so
+    only those two are tried, in each direction.
+    """
+    for direction in (1, -1):
+        violation = first_violation(report, direction)
+        if violation is None or any(first_violation(report, direction, skip) is None for skip in violation):
             return True
     return False
 
+def count_safe_reports(lines):
+    """Both part totals over reports streamed line by line, e.g. from an open file"""
+    safe = safe_with_removal = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        report = list_list_int(line)
+        if is_safe_with_removal(report):
+            safe_with_removal += 1
+            safe += first_violation(report, 1) is None or first_violation(report, -1) is None
+    return safe, safe_with_removal
+
+def count_safe_file(input_file):
+    with open(input_file) as f:
+        return count_safe_reports(f)
+
+def valid_steps(steps, direction):
+    steps = steps * direction
+    return (steps >= 1) & (steps <= 3)
+
+def safe_rows(matrix):
+    """Safety of every row of a (reports, levels) matrix"""
+    steps = np.diff(matrix, axis=1)
+    return valid_steps(steps, 1).all(axis=1) | valid_steps(steps, -1).all(axis=1)
+
+def safe_rows_with_removal(matrix):
+    """
+    Same as is_safe_with_removal on every row at once. Removing level k leaves the steps before
+    k - 1, the step from k - 1 to k + 1 and the steps after k + 1: prefix and suffix ANDs
+    of the valid steps give the first and the last of those for every k in one go.
+    """
+    rows, levels = matrix.shape
+    if levels < 3: # A single level left is always safe
+        return np.ones(rows, dtype=bool)
+
+    safe = np.zeros(rows, dtype=bool)
+    for direction in (1, -1):
+        adjacent = valid_steps(np.diff(matrix, axis=1), direction)
+        skipping = valid_steps(matrix[:, 2:] - matrix[:, :-2], direction)
+
+        prefix = np.ones((rows, levels), dtype=bool) # prefix[:, k]: steps before level k all valid
+        prefix[:, 1:] = np.logical_and.accumulate(adjacent, axis=1)
+        suffix = np.ones((rows, levels), dtype=bool) # suffix[:, k]: steps after level k all valid
+        suffix[:, :-1] = np.logical_and.accumulate(adjacent[:, ::-1], axis=1)[:, ::-1]
+
+        safe |= suffix[:, 1] | prefix[:, -2] # Removing the first or the last level
+        safe |= (prefix[:, :-2] & skipping & suffix[:, 2:]).any(axis=1)
+    return safe
+
+def count_safe_matrix(reports):
+    """Both part totals of reports of equal length"""
+    matrix = np.array(reports, dtype=np.int64)
+    return int(safe_rows(matrix).sum()), int(safe_rows_with_removal(matrix).sum())
+
+def count_safe_batch(lines, batch_size=1 << 16):
+    """
+    Both part totals over streamed lines, evaluated with NumPy. Reports are bucketed by length,
+    and a bucket is evaluated as one matrix whenever it holds batch_size reports.
+    """
+    buckets = defaultdict(list)
+    safe = safe_with_removal = 0
+
+    def flush(length):
+        nonlocal safe, safe_with_removal
+        bucket_safe, bucket_safe_with_removal = count_safe_matrix(buckets.pop(length))
+        safe += bucket_safe
+        safe_with_removal += bucket_safe_with_removal
+
+    for line in lines:
+        if not line.strip():
+            continue
+        report = list_list_int(line)
+        buckets[len(report)].append(report)
+        if len(buckets[len(report)]) >= batch_size:
+            flush(len(report))
+    for length in list(buckets):
+        flush(length)
+    return safe, safe_with_removal
+
 def solve_part1(data):
     """Solve part 1 of the puzzle."""
     reports = list(map(list_list_int, data))
@@ -38,7 +141,7 @@ def solve_part1(data):
 def solve_part2(data):
     """Solve part 2 of the puzzle."""
     reports = list(map(list_list_int, data))
-    total = len([report for report in reports if is_safe2(report)])
+    total = len([report for report in reports if is_safe_with_removal(report)])
     return total
 
 def main(input_file="input/input.txt"):
@@ -3,7 +3,10 @@ Advent of Code 2024 - Day 3
 https://adventofcode.com/2024/day/3
 """
 
+import mmap
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 
 
 def parse_input(input_data):
@@ -11,68 +14,125 @@ def parse_input(input_data):
     return [line.strip() for line in input_data.split('\n') if line.strip()]
 
 
-def calculate_multiplications(text):
-    pattern = r'mul\((\d+),(\d+)\)'
-    matches = re.finditer(pattern, text)
-    
-    total_sum = 0
-    for match in matches:
-        n1 = int(match.group(1))
-        n2 = int(match.group(2))
-        product = n1 * n2
-        total_sum += product
-    
-    return total_sum
+INSTRUCTION = re.compile(r"mul\((\d+),(\d+)\)|(do\(\))|don't\(\)")
+# Any unfinished instruction at the end of a chunk. Each one contains a single 'm' or 'd', at its start
+PARTIAL_INSTRUCTION = re.compile(r"mul\(\d+,\d*|mul\(\d*|mul|mu|m|don't\(|don't|don'|don|do\(|do|d")
 
-def calculate_multiplications2(text, initial_state=True):
-    mul_pattern = r'mul\((\d+),(\d+)\)'
-    control_pattern = r'do\(\)|don\'t\(\)'
-    
-    mul_matches = [(m.start(), int(m.group(1)), int(m.group(2))) 
-                  for m in re.finditer(mul_pattern, text)]
-    
-    control_matches = []
-    for m in re.finditer(control_pattern, text):
-        ctrl_type = 'do' if m.group(0) == 'do()' else "don't"
-        control_matches.append((m.start(), ctrl_type))
-    
-    enabled = initial_state
-    total_sum = 0
-    final_state = enabled 
-    
-    all_events = []
-    for pos, n1, n2 in mul_matches:
-        all_events.append((pos, 'mul', (n1, n2)))
-    for pos, ctrl_type in control_matches:
-        all_events.append((pos, 'control', ctrl_type))
-    
-    all_events.sort()
-    
-    for _, event_type, data in all_events:
-        if event_type == 'control':
-            enabled = (data == 'do')
-            final_state = enabled
-        elif event_type == 'mul' and enabled:
-            n1, n2 = data
-            total_sum += n1 * n2
-    
-    return total_sum, final_state
+def scan_chunk(text, enabled):
+    """Both part totals of a piece of memory, and whether mul is still enabled at its end"""
+    total = enabled_total = 0
+    for match in INSTRUCTION.finditer(text):
+        if match.group(1) is not None:
+            product = int(match.group(1)) * int(match.group(2))
+            total += product
+            if enabled:
+                enabled_total += product
+        else:
+            enabled = match.group(3) is not None
+    return total, enabled_total, enabled
+
+def unfinished_tail(text):
+    """Where an instruction cut by the end of the chunk starts, or len(text) if there is none"""
+    start = max(text.rfind('m'), text.rfind('d'))
+    if start != -1 and PARTIAL_INSTRUCTION.fullmatch(text, start):
+        return start
+    return len(text)
+
+def scan_stream(stream, chunk_size=1 << 20):
+    """
+    Both part totals of corrupted memory read in fixed-size chunks, with a single regex pass.
+    An instruction cut by a chunk boundary is carried over to the next chunk, and so is
+    the do()/don't() state.
+    """
+    total = enabled_total = 0
+    enabled = True
+    carry = ''
+    while chunk := stream.read(chunk_size):
+        text = carry + chunk
+        cut = unfinished_tail(text)
+        chunk_total, chunk_enabled_total, enabled = scan_chunk(text[:cut], enabled)
+        total += chunk_total
+        enabled_total += chunk_enabled_total
+        carry = text[cut:]
+    return total, enabled_total
+
+def scan_file(input_file, chunk_size=1 << 20):
+    with open(input_file) as f:
+        return scan_stream(f, chunk_size)
+
+BYTES_INSTRUCTION = re.compile(INSTRUCTION.pattern.encode())
+BYTES_PARTIAL_INSTRUCTION = re.compile(PARTIAL_INSTRUCTION.pattern.encode())
+
+def instructions_in_range(memory, start, end):
+    """
+    Matches of the instructions starting in [start, end). The search stops at end, and only an
+    instruction cut by it is read further, from its own start, so a range never scans the
+    rest of the file looking for its next match.
+    """
+    last_end = start
+    for match in BYTES_INSTRUCTION.finditer(memory, start, end):
+        last_end = match.end()
+        yield match
+
+    cut = max(memory.rfind(b'm', last_end, end), memory.rfind(b'd', last_end, end))
+    if cut != -1 and BYTES_PARTIAL_INSTRUCTION.fullmatch(memory, cut, end):
+        if match := BYTES_INSTRUCTION.match(memory, cut):
+            yield match
+
+def scan_range(input_file, start, end):
+    """
+    Scan the instructions starting in [start, end) of the file, reading past end to finish
+    the last one. As an instruction holds a single 'm' or 'd', at its start, no instruction
+    can be found again by the range that follows.
+    Returns the part 1 total, the mul total before the first do()/don't(), the enabled
+    mul total after it, and the state set by the last do()/don't() (None if there is none).
+    """
+    total = head_total = tail_total = 0
+    state = None
+    with open(input_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as memory:
+        for match in instructions_in_range(memory, start, end):
+            if match.group(1) is not None:
+                product = int(match.group(1)) * int(match.group(2))
+                total += product
+                if state is None:
+                    head_total += product
+                elif state:
+                    tail_total += product
+            else:
+                state = match.group(3) is not None
+    return total, head_total, tail_total, state
+
+def stitch(range_results):
+    """Exact part totals from the ranges in file order: only the state between them is missing"""
+    total = enabled_total = 0
+    enabled = True
+    for range_total, head_total, tail_total, state in range_results:
+        total += range_total
+        if enabled:
+            enabled_total += head_total
+        if state is not None:
+            enabled_total += tail_total
+            enabled = state
+    return total, enabled_total
+
+def scan_file_parallel(input_file, workers=None, ranges_per_worker=4):
+    size = os.path.getsize(input_file)
+    if size == 0:
+        return 0, 0
+    workers = workers or os.cpu_count()
+    count = min(size, workers * ranges_per_worker)
+    bounds = [size * i // count for i in range(count + 1)]
+    with ProcessPoolExecutor(workers) as executor:
+        results = executor.map(scan_range, [input_file] * count, bounds[:-1], bounds[1:])
+        return stitch(results)
 
 def solve_part1(data):
     """Solve part 1 of the puzzle."""
-    totals = map(calculate_multiplications, data)
-    return sum(totals)
+    return scan_chunk('\n'.join(data), True)[0]
 
 def solve_part2(data):
     """Solve part 2 of the puzzle."""
-    current_state = True  # Start enabled
-    total = 0
-    
-    for line in data:
-        line_sum, current_state = calculate_multiplications2(line, current_state)
-        total += line_sum
-    
-    return total
+    return scan_chunk('\n'.join(data), True)[1]
 
 def main(input_file="input/input.txt"):
     """Main function to run the solution."""
@@ -3,6 +3,13 @@ Advent of Code 2024 - Day 4
 https://adventofcode.com/2024/day/4
 """
 
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError: # The pure Python search below still works
+    np = None
+
 def parse_input(input_data):
     """Parse the puzzle input."""
     return [line.strip() for line in input_data.split('\n') if line.strip()]
@@ -31,12 +38,114 @@ ALL_DIRECTIONS      = [(x, y) for x in [-1, 0, 1] for y in [-1, 0, 1] if x != 0
 DIAGONAL_DIRECTIONS = [(x, y) for x in [-1, 0, 1] for y in [-1, 0, 1] if x != 0 and y != 0]
 
 
+def to_array(grid):
+    return np.frombuffer(''.join(grid).encode(), dtype=np.uint8).reshape(len(grid), -1)
+
+def word_starts(array, word, dx, dy):
+    """Boolean array, True where word starts and reads along (dx, dy), using shifted slices of the grid"""
+    rows, cols = array.shape
+    depth = len(word) - 1
+    row_start, row_end = max(0, -depth*dx), rows - max(0, depth*dx)
+    col_start, col_end = max(0, -depth*dy), cols - max(0, depth*dy)
+
+    starts = np.zeros((rows, cols), dtype=bool)
+    if row_start >= row_end or col_start >= col_end:
+        return starts
+    window = starts[row_start:row_end, col_start:col_end]
+    window[...] = True
+    for i, letter in enumerate(word.encode()):
+        window &= array[row_start + i*dx:row_end + i*dx, col_start + i*dy:col_end + i*dy] == letter
+    return starts
+
+def count_word(array, word, directions):
+    return sum(int(word_starts(array, word, dx, dy).sum()) for dx, dy in directions)
+
+def word_centers(array, word, dx, dy):
+    """Boolean array, True at the middle letter of every occurrence along (dx, dy)"""
+    starts = word_starts(array, word, dx, dy)
+    shift = len(word) // 2
+    centers = np.zeros_like(starts)
+    rows, cols = starts.shape
+    centers[max(0, shift*dx):rows + min(0, shift*dx), max(0, shift*dy):cols + min(0, shift*dy)] = \
+        starts[max(0, -shift*dx):rows + min(0, -shift*dx), max(0, -shift*dy):cols + min(0, -shift*dy)]
+    return centers
+
+def find_crosses(array, word):
+    """(row, col) of the centers where word is written along both diagonals, in either direction"""
+    falling = word_centers(array, word, 1, 1) | word_centers(array, word, -1, -1)
+    rising = word_centers(array, word, 1, -1) | word_centers(array, word, -1, 1)
+    return np.argwhere(falling & rising)
+
+def build_automaton(words):
+    """
+    Aho-Corasick automaton: a trie of the words (goto), the longest proper suffix of each node
+    that is also in the trie (fail), and the words ending at each node (output).
+    """
+    goto, fail, output = [{}], [0], [[]]
+    for word in dict.fromkeys(words):
+        state = 0
+        for letter in word:
+            if letter not in goto[state]:
+                goto[state][letter] = len(goto)
+                goto.append({})
+                fail.append(0)
+                output.append([])
+            state = goto[state][letter]
+        output[state].append(word)
+
+    queue = deque(goto[0].values()) # Breadth first, so that every fail link points to a finished node
+    while queue:
+        state = queue.popleft()
+        for letter, child in goto[state].items():
+            queue.append(child)
+            fallback = fail[state]
+            while fallback and letter not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[child] = goto[fallback].get(letter, 0)
+            output[child] = output[child] + output[fail[child]]
+    return goto, fail, output
+
+def line_cells(rows, cols, dx, dy):
+    """Cells of every line of the grid along (dx, dy), each line starting at the grid's edge"""
+    for start_row in range(rows):
+        for start_col in range(cols):
+            if not (0 <= start_row - dx < rows and 0 <= start_col - dy < cols):
+                row, col, cells = start_row, start_col, []
+                while 0 <= row < rows and 0 <= col < cols:
+                    cells.append((row, col))
+                    row, col = row + dx, col + dy
+                yield cells
+
+def find_words(grid, words, directions=ALL_DIRECTIONS):
+    """
+    Yield (word, (row, col), (dx, dy)) for every occurrence of any of the words, with the same
+    start and direction conventions as find_word. Every line is scanned once per direction,
+    whatever the number of words.
+    """
+    goto, fail, output = build_automaton(words)
+    rows, cols = len(grid), len(grid[0])
+
+    for dx, dy in directions:
+        for cells in line_cells(rows, cols, dx, dy):
+            state = 0
+            for i, (row, col) in enumerate(cells):
+                letter = grid[row][col]
+                while state and letter not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(letter, 0)
+                for word in output[state]:
+                    yield word, cells[i - len(word) + 1], (dx, dy)
+
 def solve_part1(data):
     """Solve part 1 of the puzzle."""
+    if np is not None:
+        return count_word(to_array(data), "XMAS", ALL_DIRECTIONS)
     return find_word(data, "XMAS", ALL_DIRECTIONS, lambda result, *_: result + 1, 0)
 
 def solve_part2(data):
     """Solve part 2 of the puzzle."""
+    if np is not None:
+        return len(find_crosses(to_array(data), "MAS"))
     center_positions = find_word(data, "MAS", DIAGONAL_DIRECTIONS,
                                  lambda result, x, y, dx, dy: result + [(x+dx, y+dy)], [])
     
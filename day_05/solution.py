@@ -2,15 +2,88 @@
 Advent of Code 2024 - Day 5
 https://adventofcode.com/2024/day/5
 """
-from typing import List, Tuple
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from functools import cmp_to_key
+from itertools import islice
+
+
+class RuleIndex:
+    """
+    Successors of every page, built once from the rulebook, to validate and repair many sequences.
+    Repaired orderings are kept in an LRU cache, as the same updates tend to come back.
+    """
+
+    def __init__(self, dependencies: List[Tuple[int, int]], cache_size: int = 1 << 16):
+        self.successors: Dict[int, Set[int]] = defaultdict(set)
+        for before, after in dependencies:
+            self.successors[before].add(after)
+        self.successors = dict(self.successors)
+        self.cache_size = cache_size
+        self.repaired: OrderedDict = OrderedDict()
+
+    def must_precede(self, before: int, after: int) -> bool:
+        return after in self.successors.get(before, ())
+
+    def is_valid(self, sequence: List[int]) -> bool:
+        """O(k²) at worst: no page may come after one of its own successors"""
+        seen = set()
+        for page in sequence:
+            if not seen.isdisjoint(self.successors.get(page, ())):
+                return False
+            seen.add(page)
+        return True
+
+    def compare(self, a: int, b: int) -> int:
+        return -1 if self.must_precede(a, b) else 1 if self.must_precede(b, a) else 0
+
+    def topological_order(self, sequence: List[int]) -> List[int]:
+        """Kahn's algorithm restricted to the pages of the sequence"""
+        pages = set(sequence)
+        in_degree = {page: 0 for page in sequence}
+        for page in sequence:
+            for after in self.successors.get(page, set()) & pages:
+                in_degree[after] += 1
+
+        queue = deque(page for page in sequence if in_degree[page] == 0)
+        result = []
+        while queue:
+            page = queue.popleft()
+            result.append(page)
+            for after in self.successors.get(page, set()) & pages:
+                in_degree[after] -= 1
+                if in_degree[after] == 0:
+                    queue.append(after)
+        return result
+
+    def repair(self, sequence: List[int]) -> List[int]:
+        """
+        Sorting with the rules as comparator is O(k log k), but only correct when the rules
+        order every pair of pages in the sequence. Anything else falls back to Kahn's algorithm.
+        """
+        key = tuple(sequence)
+        if key in self.repaired:
+            self.repaired.move_to_end(key)
+            return self.repaired[key]
+
+        ordered = sorted(sequence, key=cmp_to_key(self.compare))
+        if not self.is_valid(ordered):
+            ordered = self.topological_order(sequence)
+
+        self.repaired[key] = ordered
+        if len(self.repaired) > self.cache_size:
+            self.repaired.popitem(last=False)
+        return ordered
 
 
 @dataclass
 class PuzzleData:
     dependencies: List[Tuple[int, int]]
     sequences: List[List[int]]
+    rules: RuleIndex
 
 
 def parse_input(input_text: str) -> PuzzleData:
@@ -28,46 +101,8 @@ def parse_input(input_text: str) -> PuzzleData:
             numbers = [int(n) for n in line.split(',')]
             sequences.append(numbers)
     
-    return PuzzleData(dependencies=dependencies, sequences=sequences)
-
-
-def is_valid_sequence(sequence: List[int], dependencies: List[Tuple[int, int]]) -> bool:
-    positions = {n: idx for idx, n in enumerate(sequence)}
-    
-    return all(
-        positions[before] < positions[after]
-        for before, after in dependencies
-        if before in positions and after in positions
-    )
-
+    return PuzzleData(dependencies=dependencies, sequences=sequences, rules=RuleIndex(dependencies))
 
-def topological_sort(sequence: List[int], dependencies: List[Tuple[int, int]]) -> List[int]:
-    """
-    Kahn's algorithm for topological sorting
-    """
-    # Build graph and calculate in-degrees
-    graph = defaultdict(set)
-    in_degree = defaultdict(int)
-    
-    for before, after in dependencies:
-        if before in sequence and after in sequence:
-            graph[before].add(after)
-            in_degree[after] += 1
-    
-    # Start with nodes that have no dependencies
-    queue = [node for node in sequence if in_degree[node] == 0]
-    result = []
-    
-    while queue:
-        node = queue.pop(0)
-        result.append(node)
-        
-        for neighbor in graph[node]:
-            in_degree[neighbor] -= 1
-            if in_degree[neighbor] == 0:
-                queue.append(neighbor)
-    
-    return result
 
 def sum_middles(seqs):
     return sum(seq[len(seq)//2] for seq in seqs)
@@ -75,14 +110,86 @@ def sum_middles(seqs):
 
 def solve_part1(data: PuzzleData) -> int:
     """Find sum of middle numbers in valid sequences"""
-    valid_sequences = [seq for seq in data.sequences if is_valid_sequence(seq, data.dependencies)]
+    valid_sequences = [seq for seq in data.sequences if data.rules.is_valid(seq)]
     return sum_middles(valid_sequences)
 
 
 def solve_part2(data: PuzzleData) -> int:
     """Fix invalid sequences and sum their middle numbers"""
-    invalid_sequences = [seq for seq in data.sequences if not is_valid_sequence(seq, data.dependencies)]
-    return sum_middles([topological_sort(seq, data.dependencies) for seq in invalid_sequences])
+    invalid_sequences = [seq for seq in data.sequences if not data.rules.is_valid(seq)]
+    return sum_middles([data.rules.repair(seq) for seq in invalid_sequences])
+
+
+def read_dependencies(lines: Iterable[str]) -> List[Tuple[int, int]]:
+    """Rules at the top of the input, stops at the blank line so that lines can be streamed further"""
+    dependencies = []
+    for line in lines:
+        if not line.strip():
+            break
+        n1, n2 = map(int, line.split('|'))
+        dependencies.append((n1, n2))
+    return dependencies
+
+
+def stream_sequences(lines: Iterable[str]) -> Iterator[List[int]]:
+    for line in lines:
+        if line.strip() and '|' not in line:
+            yield [int(n) for n in line.split(',')]
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+WORKER_RULES: Optional[RuleIndex] = None
+
+
+def init_worker(rules: RuleIndex) -> None:
+    global WORKER_RULES
+    WORKER_RULES = rules
+
+
+def score_chunk(sequences: List[List[int]]) -> Tuple[int, int]:
+    """Middle-page sums of the valid sequences and of the repaired invalid ones"""
+    valid_total = repaired_total = 0
+    for seq in sequences:
+        if WORKER_RULES.is_valid(seq):
+            valid_total += seq[len(seq)//2]
+        else:
+            repaired_total += WORKER_RULES.repair(seq)[len(seq)//2]
+    return valid_total, repaired_total
+
+
+def score_batches(rules: RuleIndex, sequences: Iterable[List[int]], workers: Optional[int] = None,
+                  chunk_size: int = 10_000, max_pending: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    """
+    Yield the (part 1, part 2) sums of every chunk of sequences as soon as it completes.
+    The rulebook is sent to each worker once, and at most max_pending chunks are in flight,
+    so the sequences can be streamed from inputs much larger than memory.
+    """
+    workers = workers or os.cpu_count()
+    max_pending = max_pending or 2 * workers
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(rules,)) as executor:
+        pending = set()
+        for chunk in chunked(sequences, chunk_size):
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+            pending.add(executor.submit(score_chunk, chunk))
+        yield from (future.result() for future in as_completed(pending))
+
+
+def score_file(input_file: str, workers: Optional[int] = None, chunk_size: int = 10_000) -> Tuple[int, int]:
+    """Both parts for an input file, without ever holding all of its sequences"""
+    with open(input_file) as f:
+        rules = RuleIndex(read_dependencies(f))
+        part1 = part2 = 0
+        for valid_total, repaired_total in score_batches(rules, stream_sequences(f), workers, chunk_size):
+            part1 += valid_total
+            part2 += repaired_total
+    return part1, part2
 
 
 def main(input_file: str = "input/input.txt") -> None:
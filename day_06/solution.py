@@ -3,74 +3,174 @@ Advent of Code 2024 - Day 6
 https://adventofcode.com/2024/day/6
 """
 
-def parse_input(input_data):
-    """Parse the puzzle input."""
-    return [line.strip() for line in input_data.split('\n') if line.strip()]
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
-def find_start(grid):
-    for i, row in enumerate(grid):
-        for j, cell in enumerate(row):
-            if cell == '^':
-                return i, j
-    return -1, -1
+sys.path.append(str(Path(__file__).resolve().parent.parent)) # Shared grid module at the repository root
+from grid import SENTINEL, Grid
 
+OBSTACLE = ord('#')
 
-DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)] # Clockwise order, facing up first
+def parse_input(input_data):
+    """Parse the puzzle input."""
+    return Grid.from_text(input_data)
 
-def move(x, y, dir):
-    dx, dy = DIRECTIONS[dir]
-    return x + dx, y + dy
+def walk(grid: Grid):
+    """Yield every state (index, dir) of the guard until it leaves the grid, dir indexing grid.directions"""
+    current_index, current_dir = grid.index(*grid.find_start('^')), 0 # Start facing up
 
-def is_inside(row, col, grid):
-    return 0 <= row < len(grid) and 0 <= col < len(grid[0])
+    while True:
+        yield current_index, current_dir
+        new_index = current_index + grid.directions[current_dir]
 
-def count_path_steps(grid):        
-    current_row, current_col, current_dir = *find_start(grid), 0 # Start facing up
-    visited = set()
+        if grid[new_index] == SENTINEL:
+            return
 
-    while is_inside(current_row, current_col, grid):
-        visited.add((current_row, current_col))
-        new_row, new_col = move(current_row, current_col, current_dir)
-            
-        if grid[new_row][new_col] == '#':
+        if grid[new_index] == OBSTACLE:
             current_dir = (current_dir + 1) % 4 # Turn right
         else:
-            current_row, current_col = new_row, new_col
-    return len(visited)
+            current_index = new_index
 
+def count_path_steps(grid):
+    return len({index for index, _ in walk(grid)})
 
-def has_loop(grid, added_obstacle):    
-    visited_states = set() # Now we need direction too. State is defined as: row, col, dir
-    current_row, current_col, current_dir = *find_start(grid), 0 # Start facing up
+
+def has_loop(grid, added_obstacle, start_state=None):
+    visited_states = set() # Now we need direction too. State is defined as: index, dir
+    current_index, current_dir = start_state or (grid.index(*grid.find_start('^')), 0) # Start facing up
     
-    while (current_state := (current_row, current_col, current_dir)) not in visited_states:
+    while (current_state := (current_index, current_dir)) not in visited_states:
         visited_states.add(current_state)
-        new_row, new_col = move(*current_state)
+        new_index = current_index + grid.directions[current_dir]
         
-        if not is_inside(new_row, new_col, grid):
+        if grid[new_index] == SENTINEL:
             return False
                     
-        if grid[new_row][new_col] == '#' or (new_row, new_col) == added_obstacle:
+        if grid[new_index] == OBSTACLE or new_index == added_obstacle:
             current_dir = (current_dir + 1) % 4
         else:
-            current_row, current_col = new_row, new_col           
+            current_index = new_index
     return True
         
 
-def simulate_all_obstacles(grid):
-    return sum(
-            cell in {'.', '^'} and has_loop(grid, (i, j))
-            for i, row in enumerate(grid) 
-            for j, cell in enumerate(row)
-        )
+def build_obstacle_index(grid):
+    """Sorted obstacle columns of every row, and sorted obstacle rows of every column"""
+    cols_by_row = [[] for _ in range(grid.height)]
+    rows_by_col = [[] for _ in range(grid.width)]
+    for index in grid.find_all('#'): # Row by row, so both lists come out sorted
+        i, j = grid.position(index)
+        cols_by_row[i].append(j)
+        rows_by_col[j].append(i)
+    return cols_by_row, rows_by_col
+
+def next_stop(index, added_obstacle, row, col, dir):
+    """
+    Cell where the guard stops before the next obstacle, or None if it walks out of the grid.
+    The added obstacle overrides the index whenever it is in the way and closer.
+    """
+    cols_by_row, rows_by_col = index
+    obstacle_row, obstacle_col = added_obstacle
+
+    if dir == 0: # Up
+        rows = rows_by_col[col]
+        k = bisect_left(rows, row) - 1
+        hit = rows[k] if k >= 0 else None
+        if obstacle_col == col and obstacle_row < row and (hit is None or obstacle_row > hit):
+            hit = obstacle_row
+        return None if hit is None else (hit + 1, col)
+    if dir == 1: # Right
+        cols = cols_by_row[row]
+        k = bisect_right(cols, col)
+        hit = cols[k] if k < len(cols) else None
+        if obstacle_row == row and obstacle_col > col and (hit is None or obstacle_col < hit):
+            hit = obstacle_col
+        return None if hit is None else (row, hit - 1)
+    if dir == 2: # Down
+        rows = rows_by_col[col]
+        k = bisect_right(rows, row)
+        hit = rows[k] if k < len(rows) else None
+        if obstacle_col == col and obstacle_row > row and (hit is None or obstacle_row < hit):
+            hit = obstacle_row
+        return None if hit is None else (hit - 1, col)
+    # Left
+    cols = cols_by_row[row]
+    k = bisect_left(cols, col) - 1
+    hit = cols[k] if k >= 0 else None
+    if obstacle_row == row and obstacle_col < col and (hit is None or obstacle_col > hit):
+        hit = obstacle_col
+    return None if hit is None else (row, hit + 1)
+
+def has_loop_jumping(index, added_obstacle, start_state):
+    """
+    Same as has_loop, but the guard jumps from turn to turn.
+    Only the states right after a turn are stored: a loop always repeats one of them.
+    """
+    turn_states = set()
+    current_row, current_col, current_dir = start_state
+
+    while (stop := next_stop(index, added_obstacle, current_row, current_col, current_dir)) is not None:
+        current_row, current_col = stop
+        current_dir = (current_dir + 1) % 4
+        if (current_state := (current_row, current_col, current_dir)) in turn_states:
+            return True
+        turn_states.add(current_state)
+    return False
+
+def obstacle_candidates(grid):
+    """
+    Only cells on the original path can change the guard's route.
+    Each one is paired with the state just before the guard first walks into it:
+    up to that state, the route is the same with or without the obstacle.
+    """
+    candidates = []
+    seen = set()
+    previous_state = None
+    for state in walk(grid):
+        position = state[0]
+        if position not in seen:
+            seen.add(position)
+            if previous_state is not None: # The start position can't be blocked
+                candidates.append((position, previous_state))
+        previous_state = state
+    return candidates
+
+WORKER_GRID = None
+WORKER_INDEX = None # Only set when jumping
+
+def init_worker(grid, jump):
+    global WORKER_GRID, WORKER_INDEX
+    WORKER_GRID = grid
+    WORKER_INDEX = build_obstacle_index(grid) if jump else None
+
+def count_loops(candidates):
+    if WORKER_INDEX is not None: # The jumps work on rows and columns
+        position = WORKER_GRID.position
+        return sum(has_loop_jumping(WORKER_INDEX, position(obstacle), (*position(index), dir))
+                   for obstacle, (index, dir) in candidates)
+    return sum(has_loop(WORKER_GRID, obstacle, state) for obstacle, state in candidates)
+
+def simulate_path_obstacles(grid, workers=None, chunks_per_worker=4, jump=True):
+    candidates = obstacle_candidates(grid)
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        init_worker(grid, jump)
+        return count_loops(candidates)
+
+    chunk_size = len(candidates) // (workers * chunks_per_worker) + 1
+    chunks = [candidates[i:i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(grid, jump)) as executor:
+        return sum(executor.map(count_loops, chunks))
 
 def solve_part1(grid):
     """Solve part 1 of the puzzle."""
     return count_path_steps(grid)
 
-def solve_part2(grid):
+def solve_part2(grid, workers=1):
     """Solve part 2 of the puzzle."""
-    return simulate_all_obstacles(grid)
+    return simulate_path_obstacles(grid, workers)
 
 def main(input_file="input/input.txt"):
     """Main function to run the solution."""
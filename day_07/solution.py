@@ -3,7 +3,9 @@ Advent of Code 2024 - Day 7
 https://adventofcode.com/2024/day/7
 """
 
-from itertools import product
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product, repeat
 from operator import add, mul
 
 def parse_input(input_data):
@@ -24,19 +26,106 @@ def evaluate_expression(numbers, operators):
         result = operator(result, number)
     return result
 
-def can_make_test_value(test_value, numbers, operators):
+def can_make_by_enumeration(test_value, numbers, operators):
     return any(
         evaluate_expression(numbers, ops) == test_value 
         for ops in product(operators, repeat=len(numbers) - 1))
-    
+
+def next_power_of_ten(n):
+    power = 10
+    while power <= n:
+        power *= 10
+    return power
+
+def concat(x, y):
+    return x * next_power_of_ten(y) + y
+
+# Undo "left op number = target", returning left, or None when no left operand can work.
+# Operands are non-negative, so a sum can't shrink below any of its operands.
+ANY_LEFT = object() # Any left operand works, e.g. for left * 0 = 0
+
+def unadd(target, number):
+    return target - number if target >= number else None
+
+def unmul(target, number):
+    if number == 0:
+        return ANY_LEFT if target == 0 else None
+    return target // number if target % number == 0 else None
+
+def unconcat(target, number):
+    power = next_power_of_ten(number)
+    return target // power if target % power == number else None
+
+INVERSES = {add: unadd, mul: unmul, concat: unconcat}
+
+def can_make_test_value(test_value, numbers, operators):
+    """
+    Work backwards from the test value, undoing the last operation first: a branch dies as soon
+    as no operator can be undone, instead of enumerating every combination.
+    Operators without a registered inverse fall back to the full enumeration.
+    """
+    if any(op not in INVERSES for op in operators):
+        return can_make_by_enumeration(test_value, numbers, operators)
+    inverses = [INVERSES[op] for op in operators]
+
+    stack = [(test_value, len(numbers) - 1)]
+    while stack:
+        target, i = stack.pop()
+        if i == 0:
+            if target == numbers[0]:
+                return True
+            continue
+        for inverse in inverses:
+            if (left := inverse(target, numbers[i])) is ANY_LEFT:
+                return True # The numbers before always evaluate to something
+            if left is not None:
+                stack.append((left, i - 1))
+    return False
+
+def check_chunk(equations, operators):
+    """Sum of the satisfiable test values, and the equations left unsolved"""
+    total, unsolved = 0, []
+    for test_value, numbers in equations:
+        if can_make_test_value(test_value, numbers, operators):
+            total += test_value
+        else:
+            unsolved.append((test_value, numbers))
+    return total, unsolved
+
+def check_in_chunks(map_chunks, equations, operators, chunk_size):
+    """map_chunks is either map or the map of a process pool"""
+    chunks = [equations[i:i + chunk_size] for i in range(0, len(equations), chunk_size)]
+    total, unsolved = 0, []
+    for chunk_total, chunk_unsolved in map_chunks(check_chunk, chunks, repeat(operators)):
+        total += chunk_total
+        unsolved.extend(chunk_unsolved)
+    return total, unsolved
+
+def evaluate_batch(data, workers=None, chunk_size=64):
+    """
+    Both parts at once, over a process pool unless workers is 1. Part 2 only adds concatenation,
+    so every equation already satisfiable with add and mul counts for both parts, and only the
+    rest is checked again.
+    """
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        return check_both_parts(map, data, chunk_size)
+    with ProcessPoolExecutor(workers) as executor:
+        return check_both_parts(executor.map, data, chunk_size)
+
+def check_both_parts(map_chunks, data, chunk_size):
+    part1, remaining = check_in_chunks(map_chunks, data, [add, mul], chunk_size)
+    concat_only, _ = check_in_chunks(map_chunks, remaining, [add, mul, concat], chunk_size)
+    return part1, part1 + concat_only
 
 def solve_part1(data):
     return sum(test_value 
                for test_value, numbers in data 
                if can_make_test_value(test_value, numbers, [add, mul]))
 
-def solve_part2(data):
-    concat = lambda x, y: int(str(x) + str(y))
+def solve_part2(data, workers=1):
+    if workers != 1:
+        return evaluate_batch(data, workers)[1]
     return sum(test_value 
                for test_value, numbers in data 
                if can_make_test_value(test_value, numbers, [add, mul, concat]))
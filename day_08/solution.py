@@ -3,28 +3,36 @@ Advent of Code 2024 - Day 8
 https://adventofcode.com/2024/day/8
 """
 
+import os
+import sys
 from collections import defaultdict
-from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, repeat
+from math import gcd
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent)) # Shared grid module at the repository root
+from grid import Grid
 
 def parse_input(input_data):
-    lines = [line.strip() for line in input_data.split('\n') if line.strip()]
-    height = len(lines)
-    width = len(lines[0])
+    grid = Grid.from_text(input_data)
     
     # Store antennas by frequency
     antennas = defaultdict(list)
-    for y in range(height):
-        for x in range(width):
-            if lines[y][x] not in '.':
-                freq = lines[y][x]
-                antennas[freq].append((x, y))
-    
-    is_inbound = lambda x, y: 0 <= x < width and 0 <= y < height
+    for index in grid.indexes():
+        if grid[index] != ord('.'):
+            y, x = grid.position(index)
+            antennas[chr(grid[index])].append((x, y))
     
-    return is_inbound, antennas
+    return grid, antennas
 
-def calculate_antinodes_part1(is_inbound, antenna_positions):
+def calculate_antinodes_part1(grid, antenna_positions):
+    """
+    Antinodes can land any distance off the map, past the grid's one-cell border, so they are
+    checked against its size rather than read from it.
+    """
     antinodes = set()
+    width, height = grid.width, grid.height
 
     for (xm, ym), (xn, yn) in combinations(antenna_positions, 2):
         dx = xn - xm
@@ -33,54 +41,77 @@ def calculate_antinodes_part1(is_inbound, antenna_positions):
         xl = xm - dx
         yl = ym - dy
 
-        if is_inbound(xl, yl):
+        if 0 <= xl < width and 0 <= yl < height:
             antinodes.add((xl, yl))
 
         xo = xn + dx
         yo = yn + dy
 
-        if is_inbound(xo, yo):
+        if 0 <= xo < width and 0 <= yo < height:
             antinodes.add((xo, yo))
     
     return antinodes
 
-def calculate_antinodes_part2(is_inbound, antenna_positions):
-    antinodes = set()
+def multiples_range(start, step, size):
+    """Range of t such that 0 <= start + t*step < size, with start inside"""
+    if step > 0:
+        return -(start // step), (size - 1 - start) // step
+    return -((size - 1 - start) // -step), start // -step
+
+def resonant_bitmap(antenna_positions, width, height):
+    """
+    One byte per cell, set on every cell in line with two antennas of the frequency.
+    The step between two antennas is reduced by its gcd, and the bounds give the range of
+    multiples of that step directly. In row-major order, those cells are evenly spaced,
+    so each line is a single strided slice assignment.
+    """
+    bitmap = bytearray(width * height)
     for (xm, ym), (xn, yn) in combinations(antenna_positions, 2):
-        dx = xn - xm
-        dy = yn - ym
+        dx, dy = xn - xm, yn - ym
+        divisor = gcd(dx, dy)
+        dx, dy = dx // divisor, dy // divisor
+        if dy < 0 or (dy == 0 and dx < 0): # Walk forwards in memory
+            dx, dy = -dx, -dy
 
-        x, y = xn, yn
-        while is_inbound(x, y):
-            antinodes.add((x, y))
-            x += dx
-            y += dy
-        
-        x, y = xm, ym
-        while is_inbound(x, y):
-            antinodes.add((x, y))
-            x -= dx
-            y -= dy
+        ranges = [multiples_range(xm, dx, width)] if dx else []
+        ranges += [multiples_range(ym, dy, height)] if dy else []
+        t_min = max(low for low, _ in ranges)
+        t_max = min(high for _, high in ranges)
 
-    return antinodes
+        first = (ym + t_min*dy) * width + xm + t_min*dx
+        step = dy * width + dx
+        count = t_max - t_min + 1
+        bitmap[first:first + step*(count - 1) + 1:step] = b'\x01' * count
+    return bitmap
+
+def count_resonant_antinodes(antennas, width, height, workers=None):
+    """Bitmaps of each frequency, computed in parallel, OR-ed together as big ints"""
+    workers = workers or os.cpu_count()
+    frequencies = list(antennas.values())
+    if workers == 1:
+        bitmaps = map(resonant_bitmap, frequencies, repeat(width), repeat(height))
+        return count_set(bitmaps)
+    with ProcessPoolExecutor(workers) as executor:
+        return count_set(executor.map(resonant_bitmap, frequencies, repeat(width), repeat(height)))
+
+def count_set(bitmaps):
+    merged = 0
+    for bitmap in bitmaps:
+        merged |= int.from_bytes(bitmap, 'little')
+    return merged.bit_count() # Bytes are 0 or 1, so one bit per set cell
 
 def solve_part1(data):
-    is_inbound, antennas = data
+    grid, antennas = data
     all_antinodes = set()
     
     for freq, positions in antennas.items():
-        all_antinodes |= calculate_antinodes_part1(is_inbound, positions)
+        all_antinodes |= calculate_antinodes_part1(grid, positions)
     
     return len(all_antinodes)
 
-def solve_part2(data):
-    is_inbound, antennas = data
-    all_antinodes = set()
-    
-    for freq, positions in antennas.items():
-        all_antinodes |= calculate_antinodes_part2(is_inbound, positions)
-    
-    return len(all_antinodes)
+def solve_part2(data, workers=1):
+    grid, antennas = data
+    return count_resonant_antinodes(antennas, grid.width, grid.height, workers)
 
 def main(input_file="input/input.txt"):
     """Main function to run the solution."""
@@ -3,6 +3,8 @@ Advent of Code 2024 - Day 9
 https://adventofcode.com/2024/day/9
 """
 
+import heapq
+import mmap
 from dataclasses import dataclass
 
 def parse_input(input_data):
@@ -77,18 +79,101 @@ def compact_whole_files(disk_map):
     
     return disk
 
+def read_digit(disk_map, i):
+    digit = disk_map[i]
+    return (digit if isinstance(digit, int) else ord(digit)) - ord('0') # bytes and mmap index to ints
+
+def compact_blocks_streaming(disk_map):
+    """
+    Same result as calculate_checksum(compact_files(disk_map)) without building any block list.
+    One pointer walks the map forwards, the other walks the files backwards, holding the number of
+    blocks its file still has to move. Works on str, bytes or mmap disk maps in O(1) extra memory.
+    """
+    length = len(disk_map)
+    while length and not 0 <= read_digit(disk_map, length - 1) <= 9: # Trailing newline
+        length -= 1
+
+    right = length - 1 if (length - 1) % 2 == 0 else length - 2 # Last file
+    right_remaining = read_digit(disk_map, right)
+    position = checksum = left = 0
+
+    while left < right:
+        size = read_digit(disk_map, left)
+        if left % 2 == 0:
+            checksum += span_checksum(left // 2, position, size)
+            position += size
+        else:
+            while size > 0 and left < right:
+                moved = min(size, right_remaining)
+                checksum += span_checksum(right // 2, position, moved)
+                position += moved
+                size -= moved
+                right_remaining -= moved
+                if right_remaining == 0:
+                    right -= 2
+                    right_remaining = read_digit(disk_map, right)
+        left += 1
+
+    if left == right: # Whatever is left of the last file touched stays in place, right after the rest
+        checksum += span_checksum(right // 2, position, right_remaining)
+    return checksum
+
+def compact_file_streaming(path):
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as disk_map:
+        return compact_blocks_streaming(disk_map)
+
+def span_checksum(file_id, start, size):
+    """Checksum of a file occupying blocks start .. start + size - 1"""
+    return file_id * (size * start + size * (size - 1) // 2)
+
+def build_spans(disk_map):
+    """(start, size) of every file, indexed by file id, and free spans bucketed by size"""
+    files = []
+    free_spans = [[] for _ in range(10)] # One min-heap of start positions per size, 0 is unused
+    position = 0
+    for i, size in enumerate(map(int, disk_map)):
+        if i % 2 == 0:
+            files.append((position, size))
+        elif size > 0:
+            free_spans[size].append(position) # Already sorted, so already a heap
+        position += size
+    return files, free_spans
+
+def compact_whole_spans(disk_map):
+    """
+    Same as compact_whole_files without expanding the disk: the leftmost free span that fits a file
+    is the smallest head among the heaps of sizes >= file size. Leftover space goes back into the
+    heap of its new size. Space freed by a moved file is never used again, as every file left to
+    move sits further left.
+    """
+    files, free_spans = build_spans(disk_map)
+    checksum = 0
+
+    for file_id in range(len(files) - 1, -1, -1):
+        file_start, file_size = files[file_id]
+        best_start, best_size = file_start, 0
+        for size in range(file_size, 10):
+            if free_spans[size] and free_spans[size][0] < best_start:
+                best_start, best_size = free_spans[size][0], size
+
+        if best_size:
+            heapq.heappop(free_spans[best_size])
+            if best_size > file_size:
+                heapq.heappush(free_spans[best_size - file_size], best_start + file_size)
+        checksum += span_checksum(file_id, best_start, file_size)
+
+    return checksum
+
 def calculate_checksum(compacted):
     return sum(pos * block for pos, block in enumerate(compacted) if block != '.')
 
 def solve_part1(disk_map):
     """Solve part 1 of the puzzle."""
-    compacted = compact_files(disk_map)
-    return calculate_checksum(compacted)
+    return compact_blocks_streaming(disk_map)
 
 def solve_part2(disk_map):
     """Solve part 2 of the puzzle."""
-    compacted = compact_whole_files(disk_map)
-    return calculate_checksum(compacted)
+    return compact_whole_spans(disk_map)
 
 def main(input_file="input/input.txt"):
     """Main function to run the solution."""
@@ -3,53 +3,52 @@ Advent of Code 2024 - Day 10
 https://adventofcode.com/2024/day/10
 """
 
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent)) # Shared grid module at the repository root
+from grid import Grid
+
 def parse_input(input_data):
     """Parse the puzzle input."""
-    grid = [list(map(int, line.strip())) for line in input_data.split('\n') if line.strip()]
-    is_inside = lambda x, y: 0 <= x < len(grid[0]) and 0 <= y < len(grid)
-    return is_inside, grid
+    return Grid.from_rows([list(map(int, line.strip())) for line in input_data.split('\n') if line.strip()])
 
-DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+def score_trailheads(grid: Grid):
+    """
+    Both parts in one sweep, from height 9 down to 0, without recursion. Each cell gets the
+    bitset of the peaks it reaches (one bit per peak) and its number of trails, from the
+    neighbours one step higher. A layer's bitsets are dropped once the layer below is done.
+    """
+    cells_by_height = [[] for _ in range(10)]
+    for index in grid.indexes():
+        cells_by_height[grid[index]].append(index)
 
-def find_peaks(is_inside, grid, x, y, peaks):
-    if grid[y][x] == 9:
-        peaks.add((x, y))
-        return peaks
-    for d in DIRECTIONS:
-        new_x, new_y = x + d[0], y + d[1]
-        if is_inside(new_x, new_y) and grid[new_y][new_x] - 1 == grid[y][x]:
-            find_peaks(is_inside, grid, new_x, new_y, peaks)
-    return peaks
+    peaks = [0] * len(grid.cells)
+    trails = [0] * len(grid.cells)
+    for bit, index in enumerate(cells_by_height[9]):
+        peaks[index] = 1 << bit
+        trails[index] = 1
 
-def count_trails(is_inside, grid, x, y, total):
-    if grid[y][x] == 9:
-        return total + 1
-    for d in DIRECTIONS:
-        new_x, new_y = x + d[0], y + d[1]
-        if is_inside(new_x, new_y) and grid[new_y][new_x] - 1 == grid[y][x]:
-            total = count_trails(is_inside, grid, new_x, new_y, total)
-    return total
+    for height in range(8, -1, -1):
+        for index in cells_by_height[height]:
+            for offset in grid.directions:
+                neighbour = index + offset
+                if grid[neighbour] == height + 1: # Never true on the border
+                    peaks[index] |= peaks[neighbour]
+                    trails[index] += trails[neighbour]
+        for index in cells_by_height[height + 1]:
+            peaks[index] = 0
 
+    trailheads = cells_by_height[0]
+    return sum(peaks[index].bit_count() for index in trailheads), sum(trails[index] for index in trailheads)
 
-def solve_part1(data):
+def solve_part1(grid):
     """Solve part 1 of the puzzle."""
-    is_inside, grid = data
-    total = 0
-    for x in range(len(grid[0])):
-        for y in range(len(grid)):
-            if grid[y][x] == 0:
-                total += len(find_peaks(is_inside, grid, x, y, set()))
-    return total
+    return score_trailheads(grid)[0]
 
-def solve_part2(data):
+def solve_part2(grid):
     """Solve part 2 of the puzzle."""
-    is_inside, grid = data
-    total = 0
-    for x in range(len(grid[0])):
-        for y in range(len(grid)):
-            if grid[y][x] == 0:
-                total += count_trails(is_inside, grid, x, y, 0)
-    return total
+    return score_trailheads(grid)[1]
 
 def main(input_file="input/input.txt"):
     """Main function to run the solution."""
@@ -2,33 +2,233 @@
 Advent of Code 2024 - Day 11
 https://adventofcode.com/2024/day/11
 """
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+
+try:
+    import numpy as np
+except ImportError: # The sparse matrix powers below still work
+    np = None
 
 def parse_input(input_data):
     """Parse the puzzle input."""
     return [list(map(int, line.split())) for line in input_data.split('\n') if line.strip()][0]
 
 
+# POWERS_OF_TEN[k] == 10 ** k, grown on demand for bigger stones
+POWERS_OF_TEN = [10 ** k for k in range(20)]
+
+def digit_count(stone):
+    """Number of decimal digits of a positive stone, without going through str()"""
+    while stone >= POWERS_OF_TEN[-1]:
+        POWERS_OF_TEN.append(POWERS_OF_TEN[-1] * 10)
+    return bisect_right(POWERS_OF_TEN, stone)
+
 def transform(stone):
     if stone == 0:
         return [1]
-    s = str(stone)
-    if len(s) % 2 == 0:
-        return [int(s[:len(s)//2]), int(s[len(s)//2:])]
+    digits = digit_count(stone)
+    if digits % 2 == 0:
+        return list(divmod(stone, POWERS_OF_TEN[digits // 2]))
     return [stone * 2024]
 
-def apply(stones):
-    for blink in range(25):
+class BlinkEngine:
+    """
+    Number of stones a single stone turns into after some blinks, memoized on (stone, blinks)
+    in an LRU table shared by every query, so sweeps over many depths or seeds reuse each other.
+    The table must hold the working set of a query (about distinct stones × blinks entries),
+    otherwise evicted results get recomputed.
+    """
+
+    def __init__(self, cache_size=1 << 22):
+        self.cache_size = cache_size
+        self.counts = OrderedDict()
+
+    def lookup(self, stone, blinks):
+        key = (stone, blinks)
+        if key in self.counts:
+            self.counts.move_to_end(key)
+            return self.counts[key]
+        return None
+
+    def store(self, stone, blinks, total):
+        self.counts[(stone, blinks)] = total
+        if len(self.counts) > self.cache_size:
+            self.counts.popitem(last=False)
+
+    def count(self, stone, blinks):
+        """
+        Depth-first without recursion, so thousands of blinks are fine. A frame adds up the
+        counts of its children as they finish, so it never depends on an entry that may have
+        been evicted in the meantime.
+        """
+        if blinks == 0:
+            return 1
+        cached = self.lookup(stone, blinks)
+        if cached is not None:
+            return cached
+
+        # Frame: [stone, blinks, children not yet counted, total so far]
+        stack = [[stone, blinks, transform(stone), 0]]
+        while True:
+            frame = stack[-1]
+            stone, blinks, children, total = frame
+            if children:
+                child = children.pop()
+                if blinks == 1:
+                    frame[3] += 1
+                    continue
+                cached = self.lookup(child, blinks - 1)
+                if cached is not None:
+                    frame[3] += cached
+                else:
+                    stack.append([child, blinks - 1, transform(child), 0])
+                continue
+
+            stack.pop()
+            self.store(stone, blinks, total)
+            if not stack:
+                return total
+            stack[-1][3] += total
+
+    def count_stones(self, stones, blinks):
+        return sum(self.count(stone, blinks) * copies for stone, copies in Counter(stones).items())
+
+    def sweep(self, stones, depths):
+        """Stone count for each blink depth, shallowest first so deeper ones reuse the table"""
+        return {blinks: self.count_stones(stones, blinks) for blinks in sorted(depths)}
+
+ENGINE = BlinkEngine()
+
+def multiply_vector(vector, rows, modulus=None):
+    """Sparse {index: value} row vector times a matrix stored as one such dict per row"""
+    result = {}
+    for k, a in vector.items():
+        for j, b in rows[k].items():
+            result[j] = result.get(j, 0) + a * b
+    if modulus:
+        return {j: value % modulus for j, value in result.items() if value % modulus}
+    return result
+
+def multiply(a, b, modulus=None):
+    return [multiply_vector(row, b, modulus) for row in a]
+
+# Powers denser than this are no longer worth multiplying as dicts
+DENSE_FROM = 1 / 32
+
+def density(rows):
+    return sum(map(len, rows)) / len(rows) ** 2
+
+def limb_bits(size, modulus):
+    """
+    Bits per limb in dense_product, so that a size-long dot product of a limb (< 2^limb) and a
+    residue (< 2^bits) stays below 2^53 and float64 computes it exactly. 0 when it cannot.
+    """
+    return max(0, 53 - size.bit_length() - (modulus - 1).bit_length())
+
+def dense_product(a, b, modulus):
+    """
+    a @ b modulo a number below 2^31, for int64 arrays of residues. The products run on float64
+    BLAS: a is cut into limbs small enough for exact dot products, and the partial products are
+    recombined in int64, where residue times residue cannot overflow.
+    """
+    bits = limb_bits(a.shape[-1], modulus)
+    mask = (1 << bits) - 1
+    b = b.astype(np.float64)
+    result = np.zeros(a.shape[:-1] + b.shape[1:], dtype=np.int64)
+    for shift in range(0, (modulus - 1).bit_length(), bits):
+        limb = ((a >> shift) & mask).astype(np.float64)
+        partial = (limb @ b).astype(np.int64) % modulus
+        result = (result + partial * pow(2, shift, modulus)) % modulus
+    return result
+
+class TransitionMatrix:
+    """
+    One blink as a sparse matrix over the closed set of stones reachable from the seeds:
+    row i maps the index of each child of stones[i] to how often it appears (2 for equal halves).
+    The count after N blinks comes from M^N by repeated squaring, in O(log N) matrix products,
+    either exact or modulo some number.
+    """
+
+    def __init__(self, seeds):
+        self.stones = list(dict.fromkeys(seeds))
+        self.position = {stone: i for i, stone in enumerate(self.stones)}
+        self.rows = []
+        for stone in self.stones: # Grows while walked, until the set is closed
+            row = {}
+            for child in transform(stone):
+                if child not in self.position:
+                    self.position[child] = len(self.stones)
+                    self.stones.append(child)
+                row[self.position[child]] = row.get(self.position[child], 0) + 1
+            self.rows.append(row)
+
+    def vector(self, stones):
+        return dict(Counter(self.position[stone] for stone in stones))
+
+    def can_go_dense(self, modulus):
+        return np is not None and modulus and modulus < 1 << 31 and limb_bits(len(self.stones), modulus) > 0
+
+    def count(self, stones, blinks, modulus=None):
+        """
+        Number of stones after some blinks, for seeds taken from the closed set. The powers are
+        squared as dicts while sparse; they fill in after a few dozen blinks. From there, modular
+        counts go on with dense NumPy products. Exact counts grow by about 0.6 bits per blink, so
+        dense products of such numbers cost more than stepping the vector one blink at a time
+        through the sparse matrix, which is what they do for the remaining blinks.
+        """
+        counts = self.vector(stones)
+        power, span = self.rows, 1 # power == M^span
+        while blinks:
+            if blinks & 1:
+                counts = multiply_vector(counts, power, modulus)
+            blinks >>= 1
+            if not blinks:
+                break
+            if density(power) > DENSE_FROM:
+                if self.can_go_dense(modulus):
+                    return self.count_dense(counts, power, blinks, modulus)
+                for _ in range(2 * span * blinks):
+                    counts = multiply_vector(counts, self.rows, modulus)
+                break
+            power = multiply(power, power, modulus)
+            span *= 2
+
+        total = sum(counts.values())
+        return total % modulus if modulus else total
+
+    def count_dense(self, counts, power, blinks, modulus):
+        """Finishes count: the result is counts @ (power²)^blinks"""
+        size = len(self.stones)
+        dense_counts = np.zeros(size, dtype=np.int64)
+        for i, value in counts.items():
+            dense_counts[i] = value
+        dense_power = np.zeros((size, size), dtype=np.int64)
+        for i, row in enumerate(power):
+            for j, value in row.items():
+                dense_power[i, j] = value
+
+        dense_power = dense_product(dense_power, dense_power, modulus)
+        while blinks:
+            if blinks & 1:
+                dense_counts = dense_product(dense_counts, dense_power, modulus)
+            blinks >>= 1
+            if blinks:
+                dense_power = dense_product(dense_power, dense_power, modulus)
+        return int(dense_counts.sum()) % modulus
+
+def apply(stones, blinks=25):
+    for blink in range(blinks):
         stones = [num
                   for stone in stones
                   for num in transform(stone)]
         
     return len(stones)
 
-def apply_smart(stones):
-    from collections import Counter
+def apply_smart(stones, blinks=75):
     numbers = Counter(stones)
     
-    for blink in range(75):
+    for blink in range(blinks):
         new_numbers = Counter()
         for n, count in numbers.items():
             for stone in transform(n):
@@ -39,11 +239,11 @@ def apply_smart(stones):
 
 def solve_part1(stones):
     """Solve part 1 of the puzzle."""
-    return apply(stones)
+    return ENGINE.count_stones(stones, 25)
 
 def solve_part2(stones):
     """Solve part 2 of the puzzle."""
-    return apply_smart(stones)
+    return ENGINE.count_stones(stones, 75)
 
 def main(input_file="input/input.txt"):
     """Main function to run the solution."""
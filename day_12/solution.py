@@ -3,98 +3,161 @@ Advent of Code 2024 - Day 12
 https://adventofcode.com/2024/day/12
 """
 
+import sys
+from array import array
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent)) # Shared grid module at the repository root
+from grid import Grid, encode
+
 def parse_input(input_data):
     """Parse the puzzle input."""
-    grid = [line.strip() for line in input_data.split('\n') if line.strip()]
-    height, width = len(grid), len(grid[0])
-    is_inbound = lambda x, y: 0 <= x < width and 0 <= y < height
-    return is_inbound, grid
+    return Grid.from_text(input_data)
 
-DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+def find(parent, index):
+    """Root of the cell's region, halving the path on the way"""
+    while parent[index] != index:
+        parent[index] = parent[parent[index]]
+        index = parent[index]
+    return index
 
-def find_region(grid, is_inbound, start_row, start_col, visited):
-    if not is_inbound(start_row, start_col) or (start_row, start_col) in visited:
-        return set()
-    
-    plant_type = grid[start_row][start_col]
-    result = {(start_row, start_col)}
-    visited.add((start_row, start_col))
-    
-    for dr, dc in DIRECTIONS:
-        new_row, new_col = start_row + dr, start_col + dc
-        if is_inbound(new_row, new_col) and grid[new_row][new_col] == plant_type:
-            result |= find_region(grid, is_inbound, new_row, new_col, visited)
-    
-    return result
-
-def get_perimeter_positions(is_inbound, region):
-    perimeter_positions = set()
-    for row, col in region:
-        for dr, dc in DIRECTIONS:
-            new_row, new_col = row + dr, col + dc
-            if not is_inbound(new_row, new_col) or (new_row, new_col) not in region:
-                perimeter_positions.add((row, col, dr, dc))
-    
-    return perimeter_positions
+def cell_corners(cells, index, corner_offsets):
+    """Corners of the cell's region at this cell: outer when both sides differ, inner when only the diagonal does"""
+    plant = cells[index]
+    corners = 0
+    for side, other_side, diagonal in corner_offsets:
+        same_side, same_other_side = cells[index + side] == plant, cells[index + other_side] == plant
+        if not same_side and not same_other_side:
+            corners += 1
+        elif same_side and same_other_side and cells[index + diagonal] != plant:
+            corners += 1
+    return corners
 
-def count_sides(perimeter_positions):
-    from collections import defaultdict
+def corner_offsets(grid: Grid):
+    """(side, other side, diagonal) offsets of the four corners of a cell"""
+    return [(side, other_side, side + other_side)
+            for side, other_side in zip(grid.directions, grid.directions[1:] + grid.directions[:1])]
 
-    positions_by_orientation = defaultdict(list)
-    for row, col, dr, dc in perimeter_positions:
-        # Little hack to process vertical and horizontal edges in the same way
-        positions_by_orientation[(dr, dc)].append((row, col) if dc == 0 else (col, row))
-    
-    for positions in positions_by_orientation.values():
-        positions.sort()
-    
-    def count_continuous_edges(positions):
-        count = 1
-        prev_row, prev_col = positions[0]
-        for row, col in positions[1:]:
-            if row != prev_row or col != prev_col + 1:
-                count += 1
-            prev_row, prev_col = row, col
-        return count
-    
-    return sum(
-        count_continuous_edges(positions) 
-        for positions in positions_by_orientation.values())
+def region_stats(grid: Grid):
+    """
+    [area, perimeter, corners] of every region in one raster pass, without recursion. A region
+    has as many sides as corners. Each cell joins the regions of its up and left neighbours
+    through union-find and adds its own share to the root's totals; when it connects two
+    regions, the smaller one is merged into the bigger one.
+    """
+    cells = grid.cells
+    parent = array('i', range(len(cells)))
+    corners = corner_offsets(grid)
+    stats = {}
+
+    for index in grid.indexes():
+        plant = cells[index]
+        root = None
+        for neighbour in (index - grid.stride, index - 1):
+            if cells[neighbour] != plant:
+                continue
+            other = find(parent, neighbour)
+            if root is None:
+                root = other
+            elif other != root:
+                if stats[other][0] > stats[root][0]:
+                    root, other = other, root
+                parent[other] = root
+                stats[root] = [total + extra for total, extra in zip(stats[root], stats.pop(other))]
+        if root is None:
+            root = index
+            stats[root] = [0, 0, 0]
+        parent[index] = root
+
+        totals = stats[root]
+        totals[0] += 1
+        totals[1] += sum(cells[index + offset] != plant for offset in grid.directions)
+        totals[2] += cell_corners(cells, index, corners)
+
+    return list(stats.values())
+
+class GardenIndex:
+    """
+    Regions of a garden kept up to date while single plots change. Every cell carries the label
+    of its region, every region its [area, perimeter, corners], and both prices are running totals.
+    An edit only re-floods the regions it touches: the old region of the cell, which may split,
+    and the regions of the new plant around it, which merge through it. Other regions keep their
+    stats, as the cell differs from their plant both before and after.
+    """
+
+    def __init__(self, grid: Grid):
+        self.grid = grid.copy()
+        self.labels = array('i', [0]) * len(self.grid.cells) # 0 until flooded
+        self.corners = corner_offsets(self.grid)
+        self.regions = {}
+        self.next_label = 1
+        self.price = 0
+        self.bulk_price = 0
+        for index in self.grid.indexes():
+            if not self.labels[index]:
+                self.flood(index, {0})
 
-def solve_part1(data):
+    def flood(self, start, labels):
+        """New region from start, over the connected cells of the same plant whose label is in labels"""
+        cells = self.grid.cells
+        plant = cells[start]
+        label = self.next_label
+        self.next_label += 1
+
+        self.labels[start] = label
+        members = [start]
+        for index in members:
+            for offset in self.grid.directions:
+                neighbour = index + offset
+                if cells[neighbour] == plant and self.labels[neighbour] in labels:
+                    self.labels[neighbour] = label
+                    members.append(neighbour)
+
+        area = len(members)
+        perimeter = sum(cells[index + offset] != plant for index in members for offset in self.grid.directions)
+        corners = sum(cell_corners(cells, index, self.corners) for index in members)
+        self.regions[label] = [area, perimeter, corners]
+        self.price += area * perimeter
+        self.bulk_price += area * corners
+
+    def remove_region(self, label):
+        area, perimeter, corners = self.regions.pop(label)
+        self.price -= area * perimeter
+        self.bulk_price -= area * corners
+
+    def check_inside(self, row, col):
+        if not (0 <= row < self.grid.height and 0 <= col < self.grid.width):
+            raise IndexError(f"({row}, {col}) is outside the {self.grid.height}x{self.grid.width} garden")
+
+    def region_at(self, row, col):
+        self.check_inside(row, col)
+        return self.regions[self.labels[self.grid.index(row, col)]]
+
+    def set_cell(self, row, col, plant):
+        self.check_inside(row, col)
+        cells, index, plant = self.grid.cells, self.grid.index(row, col), encode(plant)
+        if cells[index] == plant:
+            return
+
+        old_label = self.labels[index]
+        merged = {self.labels[index + offset] for offset in self.grid.directions if cells[index + offset] == plant}
+        for label in merged | {old_label}:
+            self.remove_region(label)
+
+        cells[index] = plant
+        self.labels[index] = 0
+        self.flood(index, merged | {0})
+        for offset in self.grid.directions:
+            if self.labels[index + offset] == old_label:
+                self.flood(index + offset, {old_label})
+
+def solve_part1(grid):
     """Solve part 1 of the puzzle."""
-    is_inbound, grid = data
-    visited = set()
-    total_price = 0
-    
-    for row in range(len(grid)):
-        for col in range(len(grid[0])):
-            if (row, col) not in visited:
-                region = find_region(grid, is_inbound, row, col, visited)
-                area = len(region)
-                perimeter = len(get_perimeter_positions(is_inbound, region))
-                price = area * perimeter
-                total_price += price
-    
-    return total_price
+    return sum(area * perimeter for area, perimeter, _ in region_stats(grid))
 
-def solve_part2(data):
+def solve_part2(grid):
     """Solve part 2 of the puzzle."""
-    is_inbound, grid = data    
-    visited = set()
-    total_price = 0
-    
-    for row in range(len(grid)):
-        for col in range(len(grid[0])):
-            if (row, col) not in visited:
-                region = find_region(grid, is_inbound, row, col, visited)
-                area = len(region)
-                perimeter_positions = get_perimeter_positions(is_inbound, region)
-                sides = count_sides(perimeter_positions)
-                price = area * sides
-                total_price += price
-    
-    return total_price
+    return sum(area * sides for area, _, sides in region_stats(grid))
 
 def main(input_file="input/input.txt"):
     """Main function to run the solution."""
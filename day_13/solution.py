@@ -2,6 +2,15 @@
 Advent of Code 2024 - Day 13
 https://adventofcode.com/2024/day/13
 """
+import math
+from itertools import chain
+
+try:
+    import numpy as np
+except ImportError: # Only needed by the batch solver
+    np = None
+
+PRIZE_OFFSET = 10_000_000_000_000
 
 def parse_input(input_data):
     def parse_coords(line):
@@ -23,6 +32,8 @@ def cramer(coefficients):
     """
     a1, b1, c1, a2, b2, c2 = coefficients
     denom = a1 * b2 - b1 * a2
+    if denom == 0: # Parallel buttons, no unique solution
+        return None
         
     dx = c1 * b2 - b1 * c2
     dy = a1 * c2 - a2 * c1
@@ -32,31 +43,135 @@ def cramer(coefficients):
         
     return (dx // denom, dy // denom)
 
-def solve_part1(data):
+def extended_gcd(a, b):
+    """(g, x, y) with a*x + b*y == g == gcd(a, b)"""
+    x, y, next_x, next_y = 1, 0, 0, 1
+    while b:
+        quotient = a // b
+        a, b = b, a - quotient * b
+        x, next_x = next_x, x - quotient * next_x
+        y, next_y = next_y, y - quotient * next_y
+    return (a, x, y) if a >= 0 else (-a, -x, -y)
+
+def cheapest_on_line(u, v, w):
+    """
+    Cheapest (a, b), both >= 0, with a*u + b*v == w, when A costs 3 tokens and B costs 1.
+    All solutions are (a0 + t*v/g, b0 - t*u/g), and the cost is linear in t, so the
+    cheapest one sits at an end of the range of t keeping both presses non-negative.
+    """
+    if u == v == 0:
+        return (0, 0) if w == 0 else None
+    g, x, y = extended_gcd(u, v)
+    if w % g:
+        return None
+
+    lowest, highest = -math.inf, math.inf
+    for start, step in ((x * (w // g), v // g), (y * (w // g), -u // g)):
+        if step > 0:
+            lowest = max(lowest, -(start // step))
+        elif step < 0:
+            highest = min(highest, start // -step)
+        elif start < 0:
+            return None
+    if lowest > highest:
+        return None
+
+    # Cost can only decrease towards a finite end, as it never goes below 0
+    t = lowest if 3 * (v // g) - u // g >= 0 else highest
+    return (x * (w // g) + t * (v // g), y * (w // g) - t * (u // g))
+
+def cheapest_collinear(coefficients):
+    """Buttons on the same line: a 1D problem along any axis they move on, if the prize is on that line"""
+    a1, b1, c1, a2, b2, c2 = coefficients
+    if a1 == b1 == a2 == b2 == 0:
+        return (0, 0) if c1 == c2 == 0 else None
+    if a1 * c2 - a2 * c1 or b1 * c2 - b2 * c1:
+        return None
+    return cheapest_on_line(a1, b1, c1) if a1 or b1 else cheapest_on_line(a2, b2, c2)
+
+def cheapest_presses(coefficients):
+    """Presses of A and B reaching the prize for the fewest tokens, or None"""
+    a1, b1, _, a2, b2, _ = coefficients
+    if a1 * b2 - b1 * a2 == 0:
+        return cheapest_collinear(coefficients)
+    solution = cramer(coefficients)
+    if solution and min(solution) >= 0:
+        return solution
+    return None
+
+def coefficients_of(machine, offset=0):
+    button_a, button_b, prize = machine
+    return [
+        button_a[0], button_b[0], prize[0] + offset, # x
+        button_a[1], button_b[1], prize[1] + offset  # y
+    ]
+
+def count_tokens(data, offset=0):
     total_tokens = 0
     for machine in data:
-        button_a, button_b, prize = machine
-        
-        coefficients = [
-            button_a[0], button_b[0], prize[0], # x
-            button_a[1], button_b[1], prize[1]  # y
-        ]
-        
-        solution = cramer(coefficients)
+        solution = cheapest_presses(coefficients_of(machine, offset))
         if solution:
             a, b = solution
             total_tokens += (3*a + b)
     
     return total_tokens
 
-def solve_part2(data):
-    offset = 10_000_000_000_000
-    for machine in data:
-        prize = machine[2]
-        prize[0] += offset
-        prize[1] += offset
+def machine_array(data, offset=0):
+    """
+    (N, 6) array of [a1, b1, c1, a2, b2, c2] rows. int64 while the products of Cramer's rule
+    cannot overflow, Python ints (object dtype) otherwise.
+    """
+    values = lambda: chain.from_iterable(chain.from_iterable(data))
+    try:
+        buttons_and_prizes = np.fromiter(values(), dtype=np.int64, count=6 * len(data))
+    except OverflowError:
+        buttons_and_prizes = np.array(list(values()), dtype=object)
+    # [(ax, ay), (bx, by), (px, py)] -> [ax, bx, px, ay, by, py]
+    machines = buttons_and_prizes.reshape(-1, 3, 2).transpose(0, 2, 1).reshape(-1, 6)
+
+    largest_button = int(np.abs(machines[:, [0, 1, 3, 4]]).max(initial=0))
+    largest_prize = int(np.abs(machines[:, [2, 5]]).max(initial=0)) + abs(offset)
+    if machines.dtype != object and 2 * largest_button * max(largest_button, largest_prize) >= 1 << 63:
+        machines = machines.astype(object)
+    machines[:, [2, 5]] += offset
+    return machines
+
+def solve_batch(machines):
+    """
+    Cramer's rule over a whole machine_array at once: presses of A and B, and whether each
+    machine can be won. Machines with parallel buttons go through cheapest_collinear one by one.
+    """
+    a1, b1, c1, a2, b2, c2 = machines.T
+    denom = a1 * b2 - b1 * a2
+    collinear = denom == 0
+    divisor = np.where(collinear, 1, denom)
 
-    return solve_part1(data)
+    dx = c1 * b2 - b1 * c2
+    dy = a1 * c2 - a2 * c1
+    a, b = dx // divisor, dy // divisor
+    solvable = ~collinear & (a * divisor == dx) & (b * divisor == dy) & (a >= 0) & (b >= 0)
+
+    for row in np.flatnonzero(collinear):
+        solution = cheapest_collinear(machines[row].tolist())
+        if solution:
+            a[row], b[row] = solution
+            solvable[row] = True
+    return a, b, solvable.astype(bool)
+
+def count_tokens_batch(data, offset=0):
+    a, b, solvable = solve_batch(machine_array(data, offset))
+    # Summed as Python ints, millions of part 2 prices overflow int64
+    return sum((3 * a[solvable] + b[solvable]).tolist())
+
+def solve_part1(data):
+    if np is not None:
+        return count_tokens_batch(data)
+    return count_tokens(data)
+
+def solve_part2(data):
+    if np is not None:
+        return count_tokens_batch(data, PRIZE_OFFSET)
+    return count_tokens(data, PRIZE_OFFSET)
 
 def main(input_file="input/input.txt"):
     """Main function to run the solution."""
@@ -3,50 +3,42 @@ Advent of Code 2024 - Day 20
 https://adventofcode.com/2024/day/20
 """
 
+import sys
 from collections import deque
 from itertools import product
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent)) # Shared grid module at the repository root
+from grid import Grid
 
 def parse_input(input_data):
     """Parse the puzzle input into a 2D grid."""
-    grid = [list(line.strip()) for line in input_data.split('\n') if line.strip()]
-    is_inside = lambda x, y: 0 <= x < len(grid[0]) and 0 <= y < len(grid)
-    return is_inside, grid
-
-DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+    return Grid.from_text(input_data)
 
-def find_positions(grid, chars):
-    positions = {}
-    for y, row in enumerate(grid):
-        for x, cell in enumerate(row):
-            if cell in chars:
-                positions[cell] = (x, y)
-    return positions
-
-def bfs(grid, is_inside, start):
-    distances = [[float('inf') for _ in row] for row in grid]
-    distances[start[1]][start[0]] = 0
+def bfs(grid, start):
+    distances = [float('inf')] * len(grid.cells)
+    distances[start] = 0
     
     queue = deque([start])
     
     while queue:
-        x, y = queue.popleft()
-        current_dist = distances[y][x]
+        index = queue.popleft()
+        current_dist = distances[index]
         
-        for dx, dy in DIRECTIONS:
-            new_x, new_y = x + dx, y + dy
-            if is_inside(new_x, new_y) and grid[new_y][new_x] != '#' and distances[new_y][new_x] > current_dist + 1:
-                distances[new_y][new_x] = current_dist + 1
-                queue.append((new_x, new_y))
+        for offset in grid.directions:
+            neighbour = index + offset
+            if grid.is_inside(neighbour) and grid[neighbour] != ord('#') and distances[neighbour] > current_dist + 1:
+                distances[neighbour] = current_dist + 1
+                queue.append(neighbour)
                 
     return distances
 
-def compute_distances(grid, is_inside):
-    positions = find_positions(grid, 'SE')
-    start, end = positions['S'], positions['E']
+def compute_distances(grid):
+    start, end = grid.find_all('S')[0], grid.find_all('E')[0]
     
-    dist_from_start = bfs(grid, is_inside, start)
-    dist_from_end = bfs(grid, is_inside, end)
-    normal_dist = dist_from_start[end[1]][end[0]]
+    dist_from_start = bfs(grid, start)
+    dist_from_end = bfs(grid, end)
+    normal_dist = dist_from_start[end]
     
     return dist_from_start, dist_from_end, normal_dist
 
@@ -54,35 +46,33 @@ def manhattan_distance(x1, y1, x2, y2):
     return abs(x1 - x2) + abs(y1 - y2)
 
 def reachable_from(grid, distances):
-    return {(x, y, distances[y][x])
-            for y, row in enumerate(grid)
-            for x, e in enumerate(row)
-            if e != '#' and distances[y][x] != float('inf')}
+    return [(index, distances[index]) for index in grid.indexes() if distances[index] != float('inf')]
 
-def solve_part1(data):
+def solve_part1(grid):
     """Solve part 1 of the puzzle."""
-    is_inside, grid = data
-    dist_from_start, dist_from_end, normal_dist = compute_distances(grid, is_inside)
+    dist_from_start, dist_from_end, normal_dist = compute_distances(grid)
     shortcuts = set()
 
-    for x, y, dist_start in reachable_from(grid, dist_from_start):
-        for (dx1, dy1), (dx2, dy2) in product(DIRECTIONS, repeat=2):
-            fx, fy = x + dx1 + dx2, y + dy1 + dy2
-            if is_inside(fx, fy) and grid[fy][fx] != '#' and dist_from_end[fy][fx] != float('inf'):
+    for index, dist_start in reachable_from(grid, dist_from_start):
+        for first, second in product(grid.directions, repeat=2):
+            # Two steps can leave the border on the first and last rows
+            end = index + first + second
+            if 0 <= end < len(dist_from_end) and dist_from_end[end] != float('inf'):
                 # It is okay to abuse with "+2" because if we went back we would have use the same path
-                route_with_shortcut = dist_start + 2 + dist_from_end[fy][fx]
+                route_with_shortcut = dist_start + 2 + dist_from_end[end]
                 if normal_dist - route_with_shortcut >= 100:
-                    shortcuts.add((x, y, fx, fy))
+                    shortcuts.add((index, end))
     return len(shortcuts)
 
-def solve_part2(data):
+def solve_part2(grid):
     """Solve part 2 of the puzzle."""
-    is_inside, grid = data
-    dist_from_start, dist_from_end, normal_dist = compute_distances(grid, is_inside)
+    dist_from_start, dist_from_end, normal_dist = compute_distances(grid)
     shortcuts = set()
+    ends = [(*grid.position(index), dist_end) for index, dist_end in reachable_from(grid, dist_from_end)]
 
-    for x, y, dist_start in reachable_from(grid, dist_from_start):
-        for fx, fy, dist_end in reachable_from(grid, dist_from_end):
+    for index, dist_start in reachable_from(grid, dist_from_start):
+        y, x = grid.position(index)
+        for fy, fx, dist_end in ends:
             if (dist := manhattan_distance(x, y, fx, fy)) <= 20:
                 route_with_shortcut = dist_start + dist + dist_end
                 if normal_dist - route_with_shortcut >= 100:
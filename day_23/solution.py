@@ -19,9 +19,8 @@ def find_triangles(graph):
             for node1 in graph for node2 in graph[node1] for node3 in graph[node2]
             if node3 in graph[node1] and node3 != node1}
 
-def solve_part1(data):
+def solve_part1(graph):
     """Solve part 1 of the puzzle."""
-    graph = parse_input(data)
     triangles = find_triangles(graph)
     return sum(any(node.startswith('t') for node in triangle) for triangle in triangles)
 
@@ -33,9 +32,8 @@ def find_max_clique(graph):
     
     return bron_kerbosch(set(), list(graph.keys()))
 
-def solve_part2(data):
+def solve_part2(graph):
     """Solve part 2 of the puzzle."""
-    graph = parse_input(data)
     max_clique = find_max_clique(graph)    
     return ','.join(sorted(max_clique))
 
@@ -45,11 +43,14 @@ def main(input_file="input/input.txt"):
     with open(input_file) as f:
         input_data = f.read()
     
+    # Parse input
+    data = parse_input(input_data)
+    
     # Solve parts
-    part1_solution = solve_part1(input_data)
+    part1_solution = solve_part1(data)
     print(f"Part 1: {part1_solution}")
     
-    part2_solution = solve_part2(input_data)
+    part2_solution = solve_part2(data)
     print(f"Part 2: {part2_solution}")
 
 if __name__ == "__main__":
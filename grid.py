@@ -0,0 +1,94 @@
+"""
+Compact grid shared by the grid days.
+Cells are stored row by row in one flat bytearray, surrounded by a one-cell border of SENTINEL.
+Every neighbour of an inner cell is then a valid index, and walking off the map lands on
+SENTINEL instead of needing a bounds check.
+Days using it put the repository root on sys.path before importing it, so that they still run
+from their own directory.
+"""
+
+SENTINEL = 255
+
+
+class Grid:
+    def __init__(self, height, width, fill='.'):
+        self.height = height
+        self.width = width
+        self.stride = width + 2
+        self.cells = bytearray([SENTINEL]) * (self.stride * (height + 2))
+        for row in range(height):
+            start = self.index(row, 0)
+            self.cells[start:start + width] = bytes([encode(fill)]) * width
+
+        # Clockwise, facing up first
+        self.directions = (-self.stride, 1, self.stride, -1)
+        self.diagonals = (-self.stride - 1, -self.stride + 1, self.stride + 1, self.stride - 1)
+        self.neighbours = self.directions + self.diagonals
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Rows of 1-character strings or of small ints (e.g. heights), all of the same length"""
+        grid = cls(len(rows), len(rows[0]))
+        for row, values in enumerate(rows):
+            start = grid.index(row, 0)
+            grid.cells[start:start + grid.width] = bytes(map(encode, values))
+        return grid
+
+    @classmethod
+    def from_text(cls, text):
+        return cls.from_rows([line.strip() for line in text.split('\n') if line.strip()])
+
+    def index(self, row, col):
+        return (row + 1) * self.stride + col + 1
+
+    def position(self, index):
+        row, col = divmod(index, self.stride)
+        return row - 1, col - 1
+
+    def __getitem__(self, index):
+        return self.cells[index]
+
+    def __setitem__(self, index, value):
+        self.cells[index] = encode(value)
+
+    def get(self, row, col):
+        return self.cells[self.index(row, col)]
+
+    def set(self, row, col, value):
+        self.cells[self.index(row, col)] = encode(value)
+
+    def is_inside(self, index):
+        return self.cells[index] != SENTINEL
+
+    def indexes(self):
+        """Index of every inner cell, row by row"""
+        for row in range(self.height):
+            start = self.index(row, 0)
+            yield from range(start, start + self.width)
+
+    def find_all(self, value):
+        value = encode(value)
+        return [index for index in self.indexes() if self.cells[index] == value]
+
+    def find_start(self, value='^'):
+        index = self.cells.find(encode(value))
+        return self.position(index) if index != -1 else (-1, -1)
+
+    def find_positions(self, chars):
+        """(row, col) of each of the given characters, the last one found wins"""
+        return {char: self.position(index) for char in chars for index in self.find_all(char)}
+
+    def copy(self):
+        grid = Grid.__new__(Grid)
+        grid.__dict__.update(self.__dict__)
+        grid.cells = self.cells.copy()
+        return grid
+
+    def __str__(self):
+        return '\n'.join(
+            ''.join(chr(value) if value >= ord(' ') else str(value) for value in self.cells[start:start + self.width])
+            for start in (self.index(row, 0) for row in range(self.height)))
+
+
+def encode(value):
+    return ord(value) if isinstance(value, str) else value
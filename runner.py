@@ -0,0 +1,122 @@
+"""
+Advent of Code 2024 - run the whole calendar
+Every day_NN/solution.py is imported as a package module and run in a process pool,
+slowest days first, with the wall time of each phase reported.
+
+Usage: python runner.py [DAY ...] [--workers N] [--input input.txt]
+"""
+
+import argparse
+import importlib
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+# Rough wall time in seconds on a puzzle-sized input, only used to order the work queue
+EXPECTED_SECONDS = {
+    6: 60, 14: 30, 20: 20, 22: 15, 9: 10, 16: 5, 18: 5, 7: 5,
+    12: 2, 11: 2, 23: 2, 19: 1, 15: 1, 4: 1,
+}
+
+PHASES = ["import", "parse", "part1", "part2"]
+
+
+@dataclass
+class DayResult:
+    day: int
+    answers: dict = field(default_factory=dict)
+    timings: dict = field(default_factory=dict)
+    error: str = None
+
+    @property
+    def total(self):
+        return sum(self.timings.values())
+
+
+def discover_days(root=ROOT):
+    return sorted(int(path.parent.name[len("day_"):]) for path in root.glob("day_*/solution.py"))
+
+
+def load_day(day):
+    return importlib.import_module(f"day_{day:02d}.solution")
+
+
+def input_path(day, input_name="input.txt"):
+    return ROOT / f"day_{day:02d}" / "input" / input_name
+
+
+def schedule(days):
+    """Longest expected day first, so the slowest day starts as early as possible"""
+    return sorted(days, key=lambda day: (-EXPECTED_SECONDS.get(day, 0), day))
+
+
+def timed(result, phase, fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    result.timings[phase] = time.perf_counter() - start
+    return value
+
+
+def run_day(day, input_name="input.txt"):
+    result = DayResult(day)
+    try:
+        with open(input_path(day, input_name)) as f:
+            input_data = f.read()
+
+        module = timed(result, "import", load_day, day)
+        data = timed(result, "parse", module.parse_input, input_data)
+
+        for part in (1, 2):
+            solver = getattr(module, f"solve_part{part}", None)
+            if solver is not None:
+                result.answers[part] = timed(result, f"part{part}", solver, data)
+    except Exception:
+        result.error = traceback.format_exc(limit=3).strip().splitlines()[-1]
+    return result
+
+
+def run_all(days, workers=None, input_name="input.txt"):
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_day, day, input_name) for day in schedule(days)]
+        for future in as_completed(futures):
+            results.append(future.result())
+    return sorted(results, key=lambda result: result.day)
+
+
+def format_report(results, wall_time):
+    header = f"{'day':>3} " + " ".join(f"{phase:>8}" for phase in PHASES) + f" {'total':>8}  answers"
+    lines = [header, "-" * len(header)]
+
+    for result in results:
+        timings = " ".join(
+            f"{result.timings[phase]:8.3f}" if phase in result.timings else f"{'-':>8}"
+            for phase in PHASES)
+        answers = result.error or ", ".join(f"{part}: {answer}" for part, answer in result.answers.items())
+        lines.append(f"{result.day:>3} {timings} {result.total:8.3f}  {answers}")
+
+    lines.append("-" * len(header))
+    lines.append(f"sum of days: {sum(result.total for result in results):.3f}s, wall time: {wall_time:.3f}s")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run all Advent of Code 2024 days in parallel")
+    parser.add_argument("days", nargs="*", type=int, help="days to run (default: every day found)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="size of the process pool")
+    parser.add_argument("--input", default="input.txt", help="input file name inside each day_NN/input/")
+    args = parser.parse_args()
+
+    days = args.days or discover_days()
+    start = time.perf_counter()
+    results = run_all(days, args.workers, args.input)
+    print(format_report(results, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()